@@ -6,9 +6,14 @@ Requires the definition of the following environment variables:
 """
 
 import os
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from functools import partial
+from types import MappingProxyType
 
+import orjson
 from fastapi import Depends, FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from loguru import logger
 
 from feddit_analyzer import __version__
@@ -56,10 +61,12 @@ from feddit_analyzer.sentiment_analysis.errors import (
 
 from . import _core as core
 from ._schemas import (
+    CommentSentiment,
     CommentSentimentIDRequest,
     CommentSentimentIDResponse,
     CommentSentimentRequest,
     CommentSentimentResponse,
+    ErrorResponse,
     VersionResponse,
 )
 
@@ -72,11 +79,116 @@ You can:
 
 _API_PREFIX = "/api/v1"
 
+_ERROR_RESPONSES: dict[type[Exception], tuple[int, str]] = {
+    FedditBadRequestError: (400, "The request made to the Feddit API was invalid."),
+    FedditNotFoundError: (404, "The requested resource could not be found in the Feddit API."),
+    FedditInternalServerError: (500, "The Feddit API encountered an internal server error."),
+    FedditResponseValidationError: (
+        500,
+        "The response from the Feddit API did not match the expected format.",
+    ),
+    FedditUnexpectedError: (
+        500,
+        "An unexpected error occurred while communicating with the Feddit API.",
+    ),
+    SubfedditNotFoundError: (
+        404,
+        "The specified subfeddit could not be found. Please check the subfeddit and try again.",
+    ),
+    APIClientError: (
+        500,
+        "An error occurred with the Feddit API client. Please try again later.",
+    ),
+    APIVersionError: (400, "The API version being used is not supported."),
+    ModelInternalServerError: (
+        500,
+        "The sentiment analysis model API encountered an internal server error.",
+    ),
+    InvalidPolarityError: (400, "The provided polarity value '{exc.polarity}' is invalid."),
+    ModelAPIError: (500, "An error occurred with the sentiment analysis model API."),
+    ModelResponseValidationError: (
+        500,
+        "The response from the sentiment analysis model API did not match the expected format.",
+    ),
+    ModelUnexpectedError: (
+        500,
+        "An unexpected error occurred with the sentiment analysis model API.",
+    ),
+    ModelBadRequestError: (
+        400,
+        "The request made to the sentiment analysis model API was invalid.",
+    ),
+    ModelNotFoundError: (
+        404,
+        "The requested resource could not be found in the sentiment analysis model API. "
+        "Please verify the model URI.",
+    ),
+}
+"""Status code and message template of the error responses by exception class. Messages can
+refer to the exception being handled as ``exc``."""
+
+_ERROR_MESSAGES_JSON = MappingProxyType(
+    {
+        exc_type: orjson.dumps(message)
+        for exc_type, (_, message) in _ERROR_RESPONSES.items()
+        if "{exc" not in message
+    }
+)
+"""Error messages serialized at import time, for the messages that do not depend on the
+exception being handled."""
+
+_ERROR_RESPONSES_DOCS = {
+    status_code: {"model": ErrorResponse}
+    for status_code in sorted({status_code for status_code, _ in _ERROR_RESPONSES.values()})
+}
+"""OpenAPI documentation of the error responses of the endpoints that call the external APIs."""
+
+_COMMENTS_RESPONSES_DOCS = {
+    200: {
+        "content": {
+            "text/event-stream": {
+                "schema": {"type": "string"},
+                "example": (
+                    'data: {"comment_id":1,"comment":"I like this.","polarity":0.5,'
+                    '"classification":"positive"}\n\n'
+                ),
+            }
+        },
+    },
+    **_ERROR_RESPONSES_DOCS,
+}
+"""OpenAPI documentation of the responses of the endpoints for sentiment analysis of comments."""
+
 _TAGS_METADATA = [
     {"name": "base", "description": "Base API endpoints."},
     {"name": "subfeddit", "description": "Endpoints for sentiment analysis of Feddit comments."},
 ]
 
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create the clients shared by all the requests served by the application, and close them
+    when the application shuts down.
+
+    :param app: The application being started.
+    :raises RuntimeError: If the environment variable ``FEDDIT_API_BASE_URL`` is not set.
+    :return: An asynchronous iterator that yields once the clients are created.
+    """
+    try:
+        base_url = os.environ["FEDDIT_API_BASE_URL"]
+    except KeyError as exc:
+        raise RuntimeError("Environment variable FEDDIT_API_BASE_URL is not set.") from exc
+
+    async with (
+        FedditAPIClient(base_url=base_url) as feddit_client,
+        SentimentAnalyzer() as sentiment_analyzer,
+    ):
+        app.state.feddit_client = feddit_client
+        app.state.sentiment_analyzer = sentiment_analyzer
+
+        yield
+
+
 app = FastAPI(
     title="Feddit Analyzer",
     summary="API for sentiment analysis of text statements from Feddit.",
@@ -85,29 +197,27 @@ app = FastAPI(
     contact={"name": "Martín Martínez, Daniel", "email": "dantiana98@gmail.com"},
     license_info={"name": "MIT License", "url": "https://opensource.org/license/MIT"},
     openapi_tags=_TAGS_METADATA,
+    default_response_class=ORJSONResponse,
+    lifespan=_lifespan,
 )
 
 
-def get_feddit_api_client() -> FedditAPIClient:
-    """Get the Feddit API client.
+def get_feddit_api_client(request: Request) -> FedditAPIClient:
+    """Get the Feddit API client shared by the application.
 
-    :raises RuntimeError: If the environment variable ``FEDDIT_API_BASE_URL`` is not set.
+    :param request: The request being processed.
     :return: The Feddit API client.
     """
-    try:
-        base_url = os.environ["FEDDIT_API_BASE_URL"]
-    except KeyError as exc:
-        raise RuntimeError("Environment variable FEDDIT_API_BASE_URL is not set.") from exc
+    return request.app.state.feddit_client
 
-    return FedditAPIClient(base_url=base_url)
 
+def get_sentiment_analyzer(request: Request) -> SentimentAnalyzer:
+    """Get the sentiment analyzer shared by the application.
 
-def get_sentiment_analyzer() -> SentimentAnalyzer:
-    """Get the sentiment analyzer.
-
+    :param request: The request being processed.
     :return: The sentiment analyzer.
     """
-    return SentimentAnalyzer()
+    return request.app.state.sentiment_analyzer
 
 
 @app.get(
@@ -139,20 +249,25 @@ async def get_version() -> dict[str, str]:
     response_description=(
         "Sentiment analysis of 25 most recent comments from a specific subfeddit in a time range."
     ),
+    responses=_COMMENTS_RESPONSES_DOCS,
     tags=["subfeddit"],
 )
 async def get_classified_comments_from_id(
     request: CommentSentimentIDRequest,
     feddit_client: FedditAPIClient = Depends(get_feddit_api_client),
     sentiment_analyzer: SentimentAnalyzer = Depends(get_sentiment_analyzer),
-) -> CommentSentimentIDResponse:
+) -> CommentSentimentIDResponse | StreamingResponse:
     """Get sentiment analysis for comments from a specific subfeddit.
 
     :param request: The request for sentiment analysis of comments.
-    :return: The sentiment analysis of the comments.
+    :return: The sentiment analysis of the comments, or a stream of server-sent events with the
+        sentiment analysis of each comment if requested.
     """
-    logger.info("Processing request for sentiment analysis of comments: {}", request)
-    sentiments = await core.analyze_comments_sentiment(
+    logger.opt(lazy=True).info(
+        "Processing request for sentiment analysis of comments: {}", lambda: request
+    )
+    analyze = partial(
+        core.analyze_comments_sentiment,
         request.subfeddit_id,
         request.min_datetime,
         request.max_datetime,
@@ -160,8 +275,14 @@ async def get_classified_comments_from_id(
         feddit_client,
         sentiment_analyzer,
     )
+
+    if request.stream:
+        logger.info("Streaming sentiment analysis of comments.")
+        return StreamingResponse(_stream_sentiments(analyze), media_type="text/event-stream")
+
+    sentiments = await analyze()
     logger.info("Sentiment analysis of comments completed.")
-    logger.debug("Sentiment analysis of comments: {}", sentiments)
+    logger.opt(lazy=True).debug("Sentiment analysis of comments: {}", lambda: sentiments)
 
     return CommentSentimentIDResponse(subfeddit_id=request.subfeddit_id, comments=sentiments)
 
@@ -178,17 +299,19 @@ async def get_classified_comments_from_id(
     response_description=(
         "Sentiment analysis of 25 most recent comments from a specific subfeddit in a time range."
     ),
+    responses=_COMMENTS_RESPONSES_DOCS,
     tags=["subfeddit"],
 )
 async def get_classified_comment_from_title(
     request: CommentSentimentRequest,
     feddit_client: FedditAPIClient = Depends(get_feddit_api_client),
     sentiment_analyzer: SentimentAnalyzer = Depends(get_sentiment_analyzer),
-) -> CommentSentimentResponse:
+) -> CommentSentimentResponse | StreamingResponse:
     """Get sentiment analysis for comments from a specific subfeddit title.
 
     :param request: The request for sentiment analysis of comments.
-    :return: The sentiment analysis of the comments.
+    :return: The sentiment analysis of the comments, or a stream of server-sent events with the
+        sentiment analysis of each comment if requested.
     """
     logger.info("Searching for subfeddit ID for title: {}", request.subfeddit_title)
 
@@ -197,7 +320,8 @@ async def get_classified_comment_from_title(
     logger.info(
         "Processing request for sentiment analysis of comments from subfeddit ID: {}", subfeddit_id
     )
-    sentiments = await core.analyze_comments_sentiment(
+    analyze = partial(
+        core.analyze_comments_sentiment,
         subfeddit_id,
         request.min_datetime,
         request.max_datetime,
@@ -205,8 +329,14 @@ async def get_classified_comment_from_title(
         feddit_client,
         sentiment_analyzer,
     )
+
+    if request.stream:
+        logger.info("Streaming sentiment analysis of comments.")
+        return StreamingResponse(_stream_sentiments(analyze), media_type="text/event-stream")
+
+    sentiments = await analyze()
     logger.info("Sentiment analysis of comments completed.")
-    logger.debug("Sentiment analysis of comments: {}", sentiments)
+    logger.opt(lazy=True).debug("Sentiment analysis of comments: {}", lambda: sentiments)
 
     return CommentSentimentResponse(
         subfeddit_id=subfeddit_id,
@@ -215,322 +345,91 @@ async def get_classified_comment_from_title(
     )
 
 
-@app.exception_handler(FedditBadRequestError)
-async def handle_feddit_bad_request_error(
-    request: Request, exc: FedditBadRequestError
-) -> JSONResponse:
-    """Handle Feddit API bad request errors.
-
-    :param request: The request that caused the error.
-    :param exc: The FedditBadRequestError exception.
-    :return: JSON response with the error message and status code 400.
-    """
-    logger.error("Feddit API bad request error: {}", exc)
-    return JSONResponse(
-        {
-            "message": "The request made to the Feddit API was invalid.",
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=400,
-    )
-
-
-@app.exception_handler(FedditNotFoundError)
-async def handle_feddit_not_found_error(request: Request, exc: FedditNotFoundError) -> JSONResponse:
-    """Handle Feddit API not found errors.
-
-    :param request: The request that caused the error.
-    :param exc: The FedditNotFoundError exception.
-    :return: JSON response with the error message and status code 404.
-    """
-    logger.error("Feddit API not found error: {}", exc)
-    return JSONResponse(
-        {
-            "message": "The requested resource could not be found in the Feddit API.",
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=404,
-    )
-
-
-@app.exception_handler(FedditInternalServerError)
-async def handle_feddit_internal_server_error(
-    request: Request, exc: FedditInternalServerError
-) -> JSONResponse:
-    """Handle Feddit API internal server errors.
-
-    :param request: The request that caused the error.
-    :param exc: The FedditInternalServerError exception.
-    :return: JSON response with the error message and status code 500.
-    """
-    logger.error("Feddit API internal server error: {}", exc)
-    return JSONResponse(
-        {
-            "message": "The Feddit API encountered an internal server error.",
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=500,
-    )
-
-
-@app.exception_handler(FedditResponseValidationError)
-async def handle_feddit_response_validation_error(
-    request: Request, exc: FedditResponseValidationError
-) -> JSONResponse:
-    """Handle Feddit API response validation errors.
-
-    :param request: The request that caused the error.
-    :param exc: The FedditResponseValidationError exception.
-    :return: JSON response with the error message and status code 500.
-    """
-    logger.error("Feddit API response validation error: {}", exc)
-    return JSONResponse(
-        {
-            "message": "The response from the Feddit API did not match the expected format.",
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=500,
-    )
-
-
-@app.exception_handler(FedditUnexpectedError)
-async def handle_feddit_unexpected_error(
-    request: Request, exc: FedditUnexpectedError
-) -> JSONResponse:
-    """Handle unexpected Feddit API errors.
+async def _handle_error(request: Request, exc: Exception) -> Response:
+    """Handle errors raised by the Feddit API client and the sentiment analysis model API.
 
     :param request: The request that caused the error.
-    :param exc: The FedditUnexpectedError exception.
-    :return: JSON response with the error message and status code 500.
+    :param exc: The exception that was raised.
+    :return: JSON response with the error message and the status code of the error.
     """
-    logger.error("Feddit API unexpected error: {}", exc)
-    return JSONResponse(
-        {
-            "message": "An unexpected error occurred while communicating with the Feddit API.",
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=500,
-    )
-
-
-@app.exception_handler(SubfedditNotFoundError)
-async def handle_subfeddit_not_found_error(
-    request: Request, exc: SubfedditNotFoundError
-) -> JSONResponse:
-    """Handle errors when a subfeddit is not found.
-
-    :param request: The request that caused the error.
-    :param exc: The SubfedditNotFoundError exception.
-    :return: JSON response with the error message and status code 404.
-    """
-    logger.error("Subfeddit not found error: {}", exc)
-    return JSONResponse(
-        {
-            "message": (
-                "The specified subfeddit could not be found. Please check the subfeddit and "
-                "try again."
-            ),
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=404,
-    )
-
-
-@app.exception_handler(APIClientError)
-async def handle_api_client_error(request: Request, exc: APIClientError) -> JSONResponse:
-    """Handle generic API client errors.
-
-    :param request: The request that caused the error.
-    :param exc: The APIClientError exception.
-    :return: JSON response with the error message and status code 500.
-    """
-    logger.error("API client error: {}", exc)
-    return JSONResponse(
-        {
-            "message": "An error occurred with the Feddit API client. Please try again later.",
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=500,
-    )
-
-
-@app.exception_handler(APIVersionError)
-async def handle_api_version_error(request: Request, exc: APIVersionError) -> JSONResponse:
-    """Handle API version errors.
-
-    :param request: The request that caused the error.
-    :param exc: The APIVersionError exception.
-    :return: JSON response with the error message and status code 400.
-    """
-    logger.error("API version error: {}", exc)
-    return JSONResponse(
-        {
-            "message": "The API version being used is not supported.",
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=400,
-    )
-
+    status_code, content = _error_content(exc)
+    return Response(content, status_code=status_code, media_type="application/json")
 
-@app.exception_handler(ModelInternalServerError)
-async def handle_model_internal_server_error(
-    request: Request, exc: ModelInternalServerError
-) -> JSONResponse:
-    """Handle internal server errors from the sentiment analysis model API.
 
-    :param request: The request that caused the error.
-    :param exc: The ModelInternalServerError exception.
-    :return: JSON response with the error message and status code 500.
-    """
-    logger.error("Model API internal server error: {}", exc)
-    return JSONResponse(
-        {
-            "message": "The sentiment analysis model API encountered an internal server error.",
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=500,
-    )
+def _error_content(exc: Exception) -> tuple[int, bytes]:
+    """Build the error response for an exception raised by the Feddit API client or the sentiment
+    analysis model API.
 
+    The status code and message of the response are looked up in ``_ERROR_RESPONSES`` by the
+    closest class of the exception. Only the parts of the ``ErrorResponse`` payload that depend on
+    the exception are serialized when handling it.
 
-@app.exception_handler(InvalidPolarityError)
-async def handle_invalid_polarity_error(
-    request: Request, exc: InvalidPolarityError
-) -> JSONResponse:
-    """Handle errors for invalid polarity values.
-
-    :param request: The request that caused the error.
-    :param exc: The InvalidPolarityError exception.
-    :return: JSON response with the error message and status code 400.
+    :param exc: The exception that was raised.
+    :return: The status code of the error and the serialized ``ErrorResponse``.
     """
-    logger.error("Invalid polarity error: {}", exc)
-    return JSONResponse(
-        {
-            "message": f"The provided polarity value '{exc.polarity}' is invalid.",
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=400,
+    exc_type = next(exc_type for exc_type in type(exc).__mro__ if exc_type in _ERROR_RESPONSES)
+    status_code, message = _ERROR_RESPONSES[exc_type]
+    logger.error("{} error: {}", type(exc).__name__, exc)
+
+    message_json = _ERROR_MESSAGES_JSON.get(exc_type) or orjson.dumps(message.format(exc=exc))
+    content = b'{"message":%b,"details":%b,"type":%b}' % (
+        message_json,
+        orjson.dumps(str(exc)),
+        orjson.dumps(type(exc).__name__),
     )
+    return status_code, content
 
 
-@app.exception_handler(ModelAPIError)
-async def handle_model_api_error(request: Request, exc: ModelAPIError) -> JSONResponse:
-    """Handle generic errors from the sentiment analysis model API.
+def _unexpected_error_content(exc: Exception) -> bytes:
+    """Build the error response for an exception that has no specific handling.
 
-    :param request: The request that caused the error.
-    :param exc: The ModelAPIError exception.
-    :return: JSON response with the error message and status code 500.
+    :param exc: The exception that was raised.
+    :return: The serialized ``ErrorResponse`` with a generic error message.
     """
-    logger.error("Model API error: {}", exc)
-    return JSONResponse(
-        {
-            "message": "An error occurred with the sentiment analysis model API.",
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=500,
+    error = ErrorResponse(
+        message="An unexpected error occurred.", details=str(exc), type="InternalServerError"
     )
+    return error.model_dump_json().encode()
 
 
-@app.exception_handler(ModelResponseValidationError)
-async def handle_model_response_validation_error(
-    request: Request, exc: ModelResponseValidationError
-) -> JSONResponse:
-    """Handle response validation errors from the sentiment analysis model API.
-
-    :param request: The request that caused the error.
-    :param exc: The ModelResponseValidationError exception.
-    :return: JSON response with the error message and status code 500.
-    """
-    logger.error("Model API response validation error: {}", exc)
-    return JSONResponse(
-        {
-            "message": (
-                "The response from the sentiment analysis model API did not match the expected "
-                "format."
-            ),
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=500,
-    )
-
+async def _stream_sentiments(
+    analyze: Callable[[], Awaitable[list[CommentSentiment]]],
+) -> AsyncIterator[bytes]:
+    """Stream the sentiment analysis of comments as server-sent events.
 
-@app.exception_handler(ModelUnexpectedError)
-async def handle_model_unexpected_error(
-    request: Request, exc: ModelUnexpectedError
-) -> JSONResponse:
-    """Handle unexpected errors from the sentiment analysis model API.
+    The sentiment analysis of each comment is sent as a separate event. As the response has
+    already started when the analysis fails, errors are sent as an ``error`` event with the
+    ``ErrorResponse`` payload instead. The analysis only starts once the response is iterated.
 
-    :param request: The request that caused the error.
-    :param exc: The ModelUnexpectedError exception.
-    :return: JSON response with the error message and status code 500.
+    :param analyze: Function that runs the sentiment analysis of the comments.
+    :return: An asynchronous iterator over the server-sent events.
     """
-    logger.error("Model API unexpected error: {}", exc)
-    return JSONResponse(
-        {
-            "message": "An unexpected error occurred with the sentiment analysis model API.",
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=500,
-    )
+    try:
+        sentiments = await analyze()
 
+    except tuple(_ERROR_RESPONSES) as exc:
+        _, content = _error_content(exc)
+        yield b"event: error\ndata: %b\n\n" % content
+        return
 
-@app.exception_handler(ModelBadRequestError)
-async def handle_model_bad_request_error(
-    request: Request, exc: ModelBadRequestError
-) -> JSONResponse:
-    """Handle bad request errors from the sentiment analysis model API.
+    except Exception as exc:
+        logger.exception("Unhandled Exception while streaming: {}", exc)
+        yield b"event: error\ndata: %b\n\n" % _unexpected_error_content(exc)
+        return
 
-    :param request: The request that caused the error.
-    :param exc: The ModelBadRequestError exception.
-    :return: JSON response with the error message and status code 400.
-    """
-    logger.error("Model API bad request error: {}", exc)
-    return JSONResponse(
-        {
-            "message": "The request made to the sentiment analysis model API was invalid.",
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=400,
-    )
+    logger.info("Sentiment analysis of comments completed.")
 
+    for sentiment in sentiments:
+        yield b"data: %b\n\n" % sentiment.model_dump_json().encode()
 
-@app.exception_handler(ModelNotFoundError)
-async def handle_model_not_found_error(request: Request, exc: ModelNotFoundError) -> JSONResponse:
-    """Handle not found errors from the sentiment analysis model API.
 
-    :param request: The request that caused the error.
-    :param exc: The ModelNotFoundError exception.
-    :return: JSON response with the error message and status code 404.
-    """
-    logger.error("Model API not found error: {}", exc)
-    return JSONResponse(
-        {
-            "message": (
-                "The requested resource could not be found in the sentiment analysis model API. "
-                "Please verify the model URI."
-            ),
-            "details": str(exc),
-            "type": type(exc).__name__,
-        },
-        status_code=404,
-    )
+# Handlers are kept as coroutines, Starlette runs synchronous exception handlers in a threadpool.
+for _exc_type in _ERROR_RESPONSES:
+    app.add_exception_handler(_exc_type, _handle_error)
 
 
 @app.exception_handler(Exception)
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> Response:
     """Handle any unhandled exceptions.
 
     :param request: The request that caused the error.
@@ -538,11 +437,6 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
     :return: JSON response with a generic error message and status code 500.
     """
     logger.error(f"Unhandled Exception: {exc}")
-    return JSONResponse(
-        status_code=500,
-        content={
-            "message": "An unexpected error occurred.",
-            "details": str(exc),
-            "type": "InternalServerError",
-        },
+    return Response(
+        _unexpected_error_content(exc), status_code=500, media_type="application/json"
     )
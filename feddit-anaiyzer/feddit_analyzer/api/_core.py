@@ -1,22 +1,84 @@
 """Implementation of the core functionlaity served by the API."""
 
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from operator import attrgetter
+from typing import TypeVar
+
 from cachetools import TTLCache
 from fastapi import HTTPException
 from loguru import logger
 
 from feddit_analyzer.feddit_client import FedditAPIClient
 from feddit_analyzer.feddit_client.errors import NotFoundError
+from feddit_analyzer.feddit_client.schemas import CommentInfo
 from feddit_analyzer.sentiment_analysis import SentimentAnalyzer
+from feddit_analyzer.sentiment_analysis.errors import ResponseValidationError
+from feddit_analyzer.sentiment_analysis.schemas import SentimentAnalysis
 
 from ._schemas import CommentSentiment
 
 _QUERY_LIMIT = 25
 _QUERY_BATCH_SIZE = 5000
+_QUERY_CONCURRENCY = 4
+_SENTIMENT_TIMEOUT = 60
+
+_T = TypeVar("_T")
+_BY_POLARITY = attrgetter("polarity")
 
 _CACHE_MAX_SIZE = 1000
 _CACHE_TTL = 600
 
 subfeddit_cache = TTLCache(_CACHE_MAX_SIZE, _CACHE_TTL)
+sentiment_cache = TTLCache(_CACHE_MAX_SIZE * _QUERY_LIMIT, _CACHE_TTL)
+
+
+class _IndexFreshness:
+    """Keep track of when the subfeddit index stored in ``subfeddit_cache`` was last refreshed.
+
+    :param ttl: Time in seconds during which a refreshed index is considered fresh.
+    :param timer: Function returning the current time in seconds. It has to match the timer of
+        ``subfeddit_cache``. Default is ``time.monotonic``.
+    """
+
+    def __init__(self, ttl: float, timer: Callable[[], float] = time.monotonic) -> None:
+        self._ttl = ttl
+        self._timer = timer
+        self._expires_at = 0.0
+        self.lock = asyncio.Lock()
+
+    def now(self) -> float:
+        """Get the current time of the timer.
+
+        :return: The current time in seconds.
+        """
+        return self._timer()
+
+    def is_fresh(self) -> bool:
+        """Check whether the index was refreshed within the TTL.
+
+        :return: Whether the index is fresh.
+        """
+        return self._timer() < self._expires_at
+
+    def mark_fresh(self, refreshed_at: float) -> None:
+        """Mark the index as refreshed.
+
+        :param refreshed_at: Time at which the refresh started. The index stops being fresh when
+            the first entries inserted by the refresh expire.
+        """
+        self._expires_at = refreshed_at + self._ttl
+
+    def invalidate(self) -> None:
+        """Mark the index as stale, so that it is refreshed on the next lookup."""
+        self._expires_at = 0.0
+
+
+_subfeddit_index = _IndexFreshness(_CACHE_TTL)
 
 
 async def get_subfeddit_id(subfeddit_title: str, feddit_client: FedditAPIClient) -> int:
@@ -25,52 +87,84 @@ async def get_subfeddit_id(subfeddit_title: str, feddit_client: FedditAPIClient)
     It is required to look exhaustively through all subfeddits to find the desired one.
     This can be improved by adding a search functionality to the Feddit API.
 
-    This function includes cache functionality to avoid unnecessary search.
+    This function includes cache functionality to avoid unnecessary search. Cached IDs are
+    trusted until they expire, or until the Feddit API reports the subfeddit as not found while
+    retrieving its comments. On a cache miss, the subfeddits are looked through until the title
+    is found, and all the titles seen are stored in the title to ID index. Once a refresh has
+    stored every subfeddit, any title that is not in the index is reported as not found without
+    looking through the subfeddits again while the index is fresh.
 
     :param subfeddit_title: The title of the subfeddit.
     :param feddit_client: The Feddit API client.
+    :raises HTTPException: If no subfeddit has the given title.
     :return: The ID of the subfeddit.
     """
     logger.info("Getting subfeddit list to find ID")
 
-    if subfeddit_title in subfeddit_cache:
-        cached_id = subfeddit_cache[subfeddit_title]
+    cached_id = subfeddit_cache.get(subfeddit_title)
 
-        try:
-            logger.debug("Getting subfeddit info from cache")
-            await feddit_client.get_subfeddit_info(cached_id)
-            logger.info("Subfeddit with title '{}' found", subfeddit_title)
-            logger.debug("Subfeddit ID found: {}", cached_id)
-            return cached_id
+    if cached_id is not None:
+        logger.info("Subfeddit with title '{}' found in cache", subfeddit_title)
+        logger.debug("Subfeddit ID found: {}", cached_id)
+        return cached_id
 
-        except NotFoundError:
-            logger.info("Subfeddit with ID {} not found", cached_id)
-            del subfeddit_cache[subfeddit_title]
+    subfeddit_id = None
+    if not _subfeddit_index.is_fresh():
+        subfeddit_id = await _refresh_subfeddit_index(subfeddit_title, feddit_client)
 
-            logger.info("Removed subfeddit {} from cache")
+    if subfeddit_id is not None:
+        logger.info("Subfeddit with title '{}' found", subfeddit_title)
+        logger.debug("Subfeddit ID found: {}", subfeddit_id)
+        return subfeddit_id
 
-    skip = 0
+    raise HTTPException(
+        status_code=404, detail=f"Subfeddit with title '{subfeddit_title}' not found"
+    )
 
-    while True:
-        subfeddit_batch = await feddit_client.get_subfeddits(skip=skip, limit=_QUERY_BATCH_SIZE)
 
-        logger.debug("Received subfeddit batch: {}", subfeddit_batch)
+async def _refresh_subfeddit_index(
+    subfeddit_title: str, feddit_client: FedditAPIClient
+) -> int | None:
+    """Store the IDs of subfeddits by title in ``subfeddit_cache`` until the given title is found.
 
-        for subfeddit in subfeddit_batch:
-            subfeddit_cache[subfeddit.title] = subfeddit.id
-            if subfeddit.title == subfeddit_title:
-                logger.info("Subfeddit with title '{}' found", subfeddit_title)
-                logger.debug("Subfeddit ID found: {}", subfeddit.id)
-                return subfeddit.id
+    Concurrent refreshes are coalesced into a single one. The index is only marked as fresh if
+    all subfeddits were stored and fit in the cache, as otherwise missing titles may not have
+    been seen or may have been evicted.
 
-        if len(subfeddit_batch) < _QUERY_BATCH_SIZE:
-            break
+    :param subfeddit_title: The title of the subfeddit to find.
+    :param feddit_client: The Feddit API client.
+    :return: The ID of the subfeddit with the given title, or ``None`` if there is none.
+    """
+    async with _subfeddit_index.lock:
+        if _subfeddit_index.is_fresh():
+            return subfeddit_cache.get(subfeddit_title)
 
-        skip += _QUERY_BATCH_SIZE
+        logger.info("Refreshing subfeddit index")
+        started = _subfeddit_index.now()
+        n_subfeddits = 0
 
-    raise HTTPException(
-        status_code=404, detail=f"Subfeddit with title '{subfeddit_title}' not found"
-    )
+        async for subfeddit_batch in _iter_pages(
+            lambda skip, limit: feddit_client.get_subfeddits(skip=skip, limit=limit)
+        ):
+            logger.opt(lazy=True).debug("Received subfeddit batch: {}", lambda: subfeddit_batch)
+
+            subfeddit_id = None
+            for subfeddit in subfeddit_batch:
+                subfeddit_cache[subfeddit.title] = subfeddit.id
+                if subfeddit.title == subfeddit_title:
+                    subfeddit_id = subfeddit.id
+
+            # The title is returned as soon as it is seen, as it may be evicted from the cache
+            # when there are more subfeddits than it can hold.
+            if subfeddit_id is not None:
+                return subfeddit_id
+
+            n_subfeddits += len(subfeddit_batch)
+
+        if n_subfeddits <= subfeddit_cache.maxsize:
+            _subfeddit_index.mark_fresh(started)
+
+        return None
 
 
 async def analyze_comments_sentiment(
@@ -86,33 +180,90 @@ async def analyze_comments_sentiment(
     Initial comment retrieval needs to be exhaustive, as from testing the API, it seems
     that they are not ordered by date.
 
+    Sentiment inference is pipelined with comment retrieval: whenever a batch of comments
+    displaces some of the most recent comments found so far, the sentiment of the new
+    candidates is requested in the background while the next batch is being fetched.
+
+    Sentiment analysis results are cached by comment ID and text, so only comments whose
+    sentiment is not cached are sent to the model. The new candidates of each batch, at most
+    ``_QUERY_LIMIT`` comments, are analyzed in a single call to the sentiment analyzer, with each
+    distinct text sent only once. The analyzer may split them into several concurrent model
+    requests.
+
     :param subfeddit_id: The ID of the subfeddit.
     :param min_datetime: If given, the minimum datetime for comments. It has to be in Unix
         epochs.
     :param max_datetime: If given, the maximum datetime for comments. It has to be in Unix
         epochs.
     :param sort_by_polarity: Whether to sort comments by polarity.
+    :raises ResponseValidationError: If the model does not return one result per text.
     :return: A list of comments with their sentiment analysis.
     """
     logger.info("Extracting comments for sentiment analysis")
-    comments = await _get_all_comments(subfeddit_id, min_datetime, max_datetime, feddit_client)
+
+    newest: list[tuple[int, int, CommentInfo]] = []
+    order = itertools.count()
+    sentiments: dict[int, SentimentAnalysis] = {}
+    pending: list[tuple[CommentInfo, asyncio.Task, int]] = []
+    # Maps each sentiment analysis task to the number of texts sent to the model.
+    tasks: dict[asyncio.Task, int] = {}
+
+    try:
+        async for comment_batch in _iter_comment_batches(
+            subfeddit_id, min_datetime, max_datetime, feddit_client
+        ):
+            new_comments = _collect_cached_sentiments(
+                _push_newest(newest, comment_batch, order), sentiments
+            )
+
+            if not new_comments:
+                continue
+
+            unique_texts: dict[str, int] = {}
+            for comment in new_comments:
+                unique_texts.setdefault(comment.text, len(unique_texts))
+
+            logger.info(
+                "Analyzing sentiment of {} new candidate comments with {} unique texts",
+                len(new_comments),
+                len(unique_texts),
+            )
+            task = asyncio.create_task(
+                sentiment_analyzer.analyze_sentiment(list(unique_texts), timeout=_SENTIMENT_TIMEOUT)
+            )
+            tasks[task] = len(unique_texts)
+            pending.extend((comment, task, unique_texts[comment.text]) for comment in new_comments)
+
+        await asyncio.gather(*tasks)
+
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    _check_sentiment_results(tasks)
+
+    comments = [comment for *_, comment in sorted(newest, reverse=True)]
+
     logger.info("Received {} comments for sentiment analysis.", len(comments))
-    logger.debug("Received comments: {}", comments)
+    logger.opt(lazy=True).debug("Received comments: {}", lambda: comments)
 
     if not comments:
         logger.warning("No comments found.")
         return []
 
-    logger.info("Analyzing sentiment of comments")
-    comments_sentiment = await sentiment_analyzer.analyze_sentiment(
-        [comment.text for comment in comments], 60
-    )
+    for comment, task, index in pending:
+        sentiment = task.result()[index]
+        sentiments[comment.id] = sentiment_cache[(comment.id, comment.text)] = sentiment
+
+    comments_sentiment = [sentiments[comment.id] for comment in comments]
 
     logger.info("Sentiment analysis of comments completed.")
-    logger.debug("Sentiment analysis of comments: {}", comments_sentiment)
+    logger.opt(lazy=True).debug("Sentiment analysis of comments: {}", lambda: comments_sentiment)
 
+    # Built from comments and sentiments that were already validated, so validation is skipped.
     responses = [
-        CommentSentiment(
+        CommentSentiment.model_construct(
             comment_id=comment.id,
             comment=comment.text,
             polarity=sentiment.polarity,
@@ -123,22 +274,92 @@ async def analyze_comments_sentiment(
 
     if sort_by_polarity:
         logger.info("Sorting comments by polarity")
-        responses.sort(key=lambda comment: comment.polarity, reverse=True)
+        # The sort is stable, so comments with equal polarity stay ordered from newest to oldest.
+        responses.sort(key=_BY_POLARITY, reverse=True)
 
     return responses
 
 
-async def _get_all_comments(
+def _push_newest(
+    newest: list[tuple[int, int, CommentInfo]],
+    comments: Iterable[CommentInfo],
+    order: Iterator[int],
+) -> list[CommentInfo]:
+    """Push comments into a bounded min-heap holding the ``_QUERY_LIMIT`` most recent comments.
+
+    Heap entries are ``(created_at, -order, comment)`` tuples, where ``order`` is a strictly
+    increasing counter. Comments are never compared with each other, and on equal creation
+    times the comment seen first is kept.
+
+    :param newest: The heap of the most recent comments seen so far, updated in place.
+    :param comments: The comments to push. They are consumed lazily.
+    :param order: The counter used to break ties between entries.
+    :return: The given comments that remain in the heap, from newest to oldest.
+    """
+    start = -next(order)
+
+    for comment in comments:
+        entry = (comment.created_at, -next(order), comment)
+
+        if len(newest) < _QUERY_LIMIT:
+            heapq.heappush(newest, entry)
+        elif entry > newest[0]:
+            heapq.heapreplace(newest, entry)
+
+    return [comment for _, rank, comment in sorted(newest, reverse=True) if rank < start]
+
+
+def _check_sentiment_results(tasks: dict[asyncio.Task, int]) -> None:
+    """Check the model returned one sentiment analysis result per text sent.
+
+    :param tasks: Mapping from each completed sentiment analysis task to the number of texts
+        sent to the model.
+    :raises ResponseValidationError: If a task did not return one result per text.
+    """
+    for task, n_texts in tasks.items():
+        n_results = len(task.result())
+        if n_results != n_texts:
+            raise ResponseValidationError(
+                f"Expected {n_texts} sentiment analysis results, got {n_results}."
+            )
+
+
+def _collect_cached_sentiments(
+    comments: list[CommentInfo], sentiments: dict[int, SentimentAnalysis]
+) -> list[CommentInfo]:
+    """Look up the cached sentiment analysis of the given comments.
+
+    :param comments: The comments to look up.
+    :param sentiments: Mapping from comment ID to sentiment analysis, where the cached results
+        are stored.
+    :return: The comments whose sentiment analysis is not cached.
+    """
+    missing = []
+
+    for comment in comments:
+        cached_sentiment = sentiment_cache.get((comment.id, comment.text))
+        if cached_sentiment is None:
+            missing.append(comment)
+        else:
+            sentiments[comment.id] = cached_sentiment
+
+    return missing
+
+
+async def _iter_comment_batches(
     subfeddit_id: int,
     min_datetime: int | None,
     max_datetime: int | None,
     feddit_client: FedditAPIClient,
-) -> list[CommentSentiment]:
-    """Get all comments from a specific subfeddit.
+) -> AsyncIterator[Iterator[CommentInfo]]:
+    """Iterate over all comments from a specific subfeddit in batches.
 
-    Comments will be sorted from newest to oldest.
+    Comment extraction is done in batches of ``_QUERY_BATCH_SIZE`` comments. Each batch is
+    yielded as a lazy iterator over its comments within the given time range, so that they can
+    be consumed without building an intermediate list.
 
-    Comment extraction is done in batches of 25 comments.
+    The Feddit API does not support filtering comments by date, nor does it return them
+    ordered by date, so all batches need to be retrieved and filtered here.
 
     :param subfeddit_id: The ID of the subfeddit.
     :param min_datetime: If given, the minimum datetime for comments. It has to be in Unix
@@ -146,36 +367,74 @@ async def _get_all_comments(
     :param max_datetime: If given, the maximum datetime for comments. It has to be in Unix
         epochs.
     :param feddit_client: The Feddit API client.
-    :return: A list of comments from the subfeddit.
+    :raises NotFoundError: If the subfeddit does not exist. It is removed from the cache first.
+    :return: An asynchronous iterator over batches of comments from the subfeddit.
     """
     logger.info("Getting comments for subfeddit {}", subfeddit_id)
 
-    skip = 0
-    comments = []
+    unbounded = min_datetime is None and max_datetime is None
+    lower = -math.inf if min_datetime is None else min_datetime
+    upper = math.inf if max_datetime is None else max_datetime
 
-    while True:
-        comment_batch = await feddit_client.get_subfeddit_comments(
-            subfeddit_id, skip=skip, limit=_QUERY_BATCH_SIZE
-        )
+    try:
+        async for comment_batch in _iter_pages(
+            lambda skip, limit: feddit_client.get_subfeddit_comments(
+                subfeddit_id, skip=skip, limit=limit
+            )
+        ):
+            if unbounded:
+                yield iter(comment_batch)
+            else:
+                yield (comment for comment in comment_batch if lower <= comment.created_at <= upper)
 
-        stop = len(comment_batch) < _QUERY_BATCH_SIZE
+    except NotFoundError:
+        _forget_subfeddit(subfeddit_id)
+        raise
 
-        comment_batch = [
-            comment
-            for comment in comment_batch
-            if (min_datetime is None or comment.created_at >= min_datetime)
-            and (max_datetime is None or comment.created_at <= max_datetime)
-        ]
 
-        comments.extend(comment_batch)
+def _forget_subfeddit(subfeddit_id: int) -> None:
+    """Remove a subfeddit that no longer exists from ``subfeddit_cache``.
+
+    The subfeddit index is invalidated as well, so that the next lookup of a title that is not
+    cached looks through the subfeddits again.
+
+    :param subfeddit_id: The ID of the subfeddit.
+    """
+    for title in [
+        title for title, cached_id in subfeddit_cache.items() if cached_id == subfeddit_id
+    ]:
+        subfeddit_cache.pop(title, None)
+        logger.info("Removed subfeddit {} from cache", title)
 
-        comments.sort(key=lambda comment: comment.created_at, reverse=True)
+    _subfeddit_index.invalidate()
 
-        comments = comments[:_QUERY_LIMIT]
 
-        if stop:
-            break
+async def _iter_pages(
+    get_page: Callable[[int, int], Awaitable[list[_T]]],
+) -> AsyncIterator[list[_T]]:
+    """Iterate over all the pages of a paginated Feddit API endpoint.
+
+    Pages have ``_QUERY_BATCH_SIZE`` items. The first page is requested alone, as most
+    collections fit in it, and the following ones are requested ``_QUERY_CONCURRENCY`` at a
+    time. Pages are yielded in order until one of them is not full.
+
+    :param get_page: Function that requests a page given the number of items to skip and the
+        maximum number of items to return.
+    :return: An asynchronous iterator over the pages.
+    """
+    skip = 0
+    pages = 1
+
+    while True:
+        batches = await asyncio.gather(
+            *(get_page(skip + page * _QUERY_BATCH_SIZE, _QUERY_BATCH_SIZE) for page in range(pages))
+        )
+
+        for batch in batches:
+            yield batch
 
-        skip += _QUERY_BATCH_SIZE
+            if len(batch) < _QUERY_BATCH_SIZE:
+                return
 
-    return comments
+        skip += pages * _QUERY_BATCH_SIZE
+        pages = _QUERY_CONCURRENCY
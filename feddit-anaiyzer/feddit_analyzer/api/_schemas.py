@@ -1,8 +1,8 @@
 """Schemas for API input and output validation."""
 
-from typing import Literal, Self
+from typing import Annotated, Literal, Self
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 _MAX_COMMENTS = 25
 
@@ -18,28 +18,83 @@ class VersionResponse(BaseModel):
     )
 
 
-class CommentSentimentIDRequest(BaseModel):
-    """Model representing the request schema for sentiment analysis of comments from subfeddit
-    ID."""
+class ErrorResponse(BaseModel):
+    """Model representing the response schema for errors."""
 
-    subfeddit_id: int = Field(
-        ..., title="Subfeddit ID", description="ID of the subfeddit.", examples=[1, 2, 3]
+    model_config = ConfigDict(extra="forbid")
+
+    message: str = Field(
+        ...,
+        title="Message",
+        description="Description of the error.",
+        examples=["An unexpected error occurred."],
+    )
+    details: str = Field(
+        ..., title="Details", description="Details of the exception that caused the error."
     )
-    min_datetime: int | None = Field(
-        None,
+    type: str = Field(
+        ...,
+        title="Type",
+        description="Type of the error.",
+        examples=["SubfedditNotFoundError", "InternalServerError"],
+    )
+
+
+# Options shared by the request schemas for sentiment analysis of comments. They are declared on
+# each request model after the subfeddit field, so that it comes first in the schemas.
+_MinDatetime = Annotated[
+    int | None,
+    Field(
         title="Min Datetime",
         description="Minimum datetime for comments. It has to be in Unix epochs.",
         examples=[0, 1213423454, 12345655],
-    )
-    max_datetime: int | None = Field(
-        None,
+    ),
+]
+_MaxDatetime = Annotated[
+    int | None,
+    Field(
         title="Max Datetime",
         description="Maximum datetime for comments. It has to be in Unix epochs.",
         examples=[0, 1213423454, 12345655],
+    ),
+]
+_SortByPolarity = Annotated[
+    bool, Field(title="Sort By Polarity", description="Sort comments by polarity.")
+]
+_Stream = Annotated[
+    bool,
+    Field(
+        title="Stream",
+        description=(
+            "Stream the sentiment analysis of each comment as a server-sent event instead of "
+            "returning all of them at once."
+        ),
+    ),
+]
+
+
+def _validate_datetime_range(min_datetime: int | None, max_datetime: int | None) -> None:
+    """Validate that the minimum datetime of a request is less than its maximum datetime.
+
+    :param min_datetime: The minimum datetime of the request, if given.
+    :param max_datetime: The maximum datetime of the request, if given.
+    :raises ValueError: If min_datetime is greater than max_datetime.
+    """
+    if min_datetime is not None and max_datetime is not None and min_datetime > max_datetime:
+        raise ValueError("min_datetime cannot be greater than max_datetime.")
+
+
+class CommentSentimentIDRequest(BaseModel):
+    """Model representing the request schema for sentiment analysis of comments from subfeddit
+    ID."""
+
+    subfeddit_id: int = Field(
+        ..., title="Subfeddit ID", description="ID of the subfeddit.", examples=[1, 2, 3]
     )
-    sort_by_polarity: bool = Field(
-        False, title="Sort By Polarity", description="Sort comments by polarity."
-    )
+    min_datetime: _MinDatetime = None
+    max_datetime: _MaxDatetime = None
+    sort_by_polarity: _SortByPolarity = False
+    stream: _Stream = False
 
     @model_validator(mode="after")
     def validate_min_max_datetime(self) -> Self:
@@ -48,13 +103,7 @@ class CommentSentimentIDRequest(BaseModel):
         :raises ValueError: If min_datetime is greater than max_datetime.
         :return: The request if it is valid.
         """
-        if (
-            self.min_datetime is not None
-            and self.max_datetime is not None
-            and self.min_datetime > self.max_datetime
-        ):
-            raise ValueError("min_datetime cannot be greater than max_datetime.")
-
+        _validate_datetime_range(self.min_datetime, self.max_datetime)
         return self
 
 
@@ -68,21 +117,10 @@ class CommentSentimentRequest(BaseModel):
         description="Title of the subfeddit.",
         examples=["title 1", "title 2"],
     )
-    min_datetime: int | None = Field(
-        None,
-        title="Min Datetime",
-        description="Minimum datetime for comments. It has to be in Unix epochs.",
-        examples=[0, 1213423454, 12345655],
-    )
-    max_datetime: int | None = Field(
-        None,
-        title="Max Datetime",
-        description="Maximum datetime for comments. It has to be in Unix epochs.",
-        examples=[0, 1213423454, 12345655],
-    )
-    sort_by_polarity: bool = Field(
-        False, title="Sort By Polarity", description="Sort comments by polarity."
-    )
+    min_datetime: _MinDatetime = None
+    max_datetime: _MaxDatetime = None
+    sort_by_polarity: _SortByPolarity = False
+    stream: _Stream = False
 
     @model_validator(mode="after")
     def validate_min_max_datetime(self) -> Self:
@@ -91,13 +129,7 @@ class CommentSentimentRequest(BaseModel):
         :raises ValueError: If min_datetime is greater than max_datetime.
         :return: The request if it is valid.
         """
-        if (
-            self.min_datetime is not None
-            and self.max_datetime is not None
-            and self.min_datetime > self.max_datetime
-        ):
-            raise ValueError("min_datetime cannot be greater than max_datetime.")
-
+        _validate_datetime_range(self.min_datetime, self.max_datetime)
         return self
 
 
@@ -113,8 +145,13 @@ class CommentSentiment(BaseModel):
         description="Content of the comment.",
         examples=["I like this.", "I dislike this."],
     )
-    polarity: float = (
-        Field(..., title="Polarity", description="Polarity of the comment.", examples=[1, 0, 0.5]),
+    polarity: float = Field(
+        ...,
+        title="Polarity",
+        description="Polarity of the comment.",
+        examples=[1, 0, 0.5],
+        ge=-1,
+        le=1,
     )
     classification: Literal["positive", "negative"] = Field(
         ..., title="Classification", description="Classification of the comment."
@@ -129,23 +166,12 @@ class CommentSentimentIDResponse(BaseModel):
         ..., title="Subfeddit ID", description="ID of the subfeddit.", examples=[1, 2, 3]
     )
     comments: list[CommentSentiment] = Field(
-        ..., title="Comments", description="List of comments with sentiment analysis."
+        ...,
+        title="Comments",
+        description="List of comments with sentiment analysis.",
+        max_length=_MAX_COMMENTS,
     )
 
-    @field_validator("comments")
-    @classmethod
-    def no_more_than_25_comments(cls, value: list[CommentSentiment]) -> list[CommentSentiment]:
-        """Validate that the number of comments is no more than 25.
-
-        :param value: The comments to validate.
-        :raises ValueError: If the number of comments is more than 25.
-        :return: The comments if they are valid.
-        """
-        if len(value) > _MAX_COMMENTS:
-            raise ValueError("Number of comments cannot be more than 25.")
-
-        return value
-
 
 class CommentSentimentResponse(BaseModel):
     """Model representing the response schema for sentiment analysis of comments."""
@@ -157,19 +183,8 @@ class CommentSentimentResponse(BaseModel):
         examples=["title 1", "title 2"],
     )
     comments: list[CommentSentiment] = Field(
-        ..., title="Comments", description="List of comments with sentiment analysis."
+        ...,
+        title="Comments",
+        description="List of comments with sentiment analysis.",
+        max_length=_MAX_COMMENTS,
     )
-
-    @field_validator("comments")
-    @classmethod
-    def no_more_than_25_comments(cls, value: list[CommentSentiment]) -> list[CommentSentiment]:
-        """Validate that the number of comments is no more than 25.
-
-        :param value: The comments to validate.
-        :raises ValueError: If the number of comments is more than 25.
-        :return: The comments if they are valid.
-        """
-        if len(value) > _MAX_COMMENTS:
-            raise ValueError("Number of comments cannot be more than 25.")
-
-        return value
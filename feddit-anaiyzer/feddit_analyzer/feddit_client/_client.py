@@ -1,13 +1,16 @@
 """Client to interact with the Feddit API."""
 
-from typing import Any, ClassVar
+from types import TracebackType
+from typing import ClassVar, Self, TypeVar
 
 import httpx
 from httpx import Response
 from loguru import logger
-from pydantic import BaseModel, ValidationError
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import TypedDict  # Pydantic requires it for Python < 3.12
 
 from .errors import (
+    APIClientError,
     APIVersionError,
     BadRequestError,
     InternalServerError,
@@ -15,20 +18,49 @@ from .errors import (
     ResponseValidationError,
     UnexpectedError,
 )
-from .schemas import (
-    CommentInfo,
-    CommentsResponse,
-    SubfedditResponse,
-    SubfedditsResponse,
-    VersionResponse,
-)
+from .schemas import CommentInfo, SubfedditInfo, SubfedditResponse
+
+_T = TypeVar("_T")
 
 _API_PREFIX = "/api/v1"
+_VERSION_PATH = "/version"
+_SUBFEDDITS_PATH = "/subfeddits/"
+_SUBFEDDIT_PATH = "/subfeddit/"
+_COMMENTS_PATH = "/comments/"
+_STATUS_ERRORS: dict[int, tuple[type[APIClientError], str]] = {
+    400: (BadRequestError, "Bad Request"),
+    404: (NotFoundError, "Not Found"),
+    500: (InternalServerError, "Internal Server Error"),
+}
+_CONNECTION_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+
+# Only the fields returned by the client are declared, so the rest of the response envelope is
+# ignored instead of validated.
+class _VersionContent(TypedDict):
+    version: str
+
+
+class _SubfedditsContent(TypedDict):
+    subfeddits: list[SubfedditInfo]
+
+
+class _CommentsContent(TypedDict):
+    comments: list[CommentInfo]
+
+
+_VERSION_ADAPTER = TypeAdapter(_VersionContent)
+_SUBFEDDITS_ADAPTER = TypeAdapter(_SubfedditsContent)
+_SUBFEDDIT_ADAPTER = TypeAdapter(SubfedditResponse)
+_COMMENTS_ADAPTER = TypeAdapter(_CommentsContent)
 
 
 class FedditAPIClient:
     """Client for interacting with the Feddit API.
 
+    The HTTP connections to the API are kept alive and reused across requests until the client
+    is closed with ``aclose`` or by using it as an asynchronous context manager.
+
     :param base_url: The base URL of the Feddit API.
     :param timeout: Default timeout for the HTTP requests in seconds. Default is 30
         seconds.
@@ -39,13 +71,31 @@ class FedditAPIClient:
     def __init__(self, base_url: str, timeout: float = 30) -> None:
         self._base_url = base_url
         self._timeout = timeout
+        self._client = httpx.AsyncClient(
+            base_url=f"{base_url}{_API_PREFIX}", timeout=timeout, limits=_CONNECTION_LIMITS
+        )
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the HTTP connections to the API."""
+        await self._client.aclose()
 
     async def check_version(self) -> None:
         """Check if the API version is supported."""
         if await self.get_version() not in self.VALID_VERSIONS:
             raise APIVersionError("API version is not supported.")
 
-    async def get_version(self, timeout: float | None = None) -> dict[str, Any]:
+    async def get_version(self, timeout: float | None = None) -> str:
         """Get Feddit API version.
 
         :param timeout: Timeout for the HTTP request in seconds. If not provided, the
@@ -53,13 +103,12 @@ class FedditAPIClient:
         :return: Feddit API version.
         """
         logger.debug("Getting API version")
-        async with httpx.AsyncClient(timeout=self._choose_timeout(timeout)) as client:
-            response = await client.get(f"{self._base_url}{_API_PREFIX}/version")
-        return _handle_response(response, VersionResponse).version
+        response = await self._client.get(_VERSION_PATH, timeout=self._choose_timeout(timeout))
+        return _handle_response(response, _VERSION_ADAPTER)["version"]
 
     async def get_subfeddits(
         self, skip: int = 0, limit: int = 10, timeout: float | None = None
-    ) -> list[SubfedditResponse]:
+    ) -> list[SubfedditInfo]:
         """Get a list of subfeddits.
 
         :param skip: The number of subfeddits to skip. Default is 0.
@@ -76,9 +125,10 @@ class FedditAPIClient:
 
         params = {"skip": skip, "limit": limit}
 
-        async with httpx.AsyncClient(timeout=self._choose_timeout(timeout)) as client:
-            response = await client.get(f"{self._base_url}{_API_PREFIX}/subfeddits/", params=params)
-        return _handle_response(response, SubfedditsResponse).subfeddits
+        response = await self._client.get(
+            _SUBFEDDITS_PATH, params=params, timeout=self._choose_timeout(timeout)
+        )
+        return _handle_response(response, _SUBFEDDITS_ADAPTER)["subfeddits"]
 
     async def get_subfeddit_info(
         self, subfeddit_id: int, timeout: float | None = None
@@ -95,9 +145,10 @@ class FedditAPIClient:
         logger.info("Getting subfeddit info for subfeddit {}", subfeddit_id)
         params = {"subfeddit_id": subfeddit_id}
 
-        async with httpx.AsyncClient(timeout=self._choose_timeout(timeout)) as client:
-            response = await client.get(f"{self._base_url}{_API_PREFIX}/subfeddit/", params=params)
-        return _handle_response(response, SubfedditResponse)
+        response = await self._client.get(
+            _SUBFEDDIT_PATH, params=params, timeout=self._choose_timeout(timeout)
+        )
+        return _handle_response(response, _SUBFEDDIT_ADAPTER)
 
     async def get_subfeddit_comments(
         self, subfeddit_id: int, skip: int = 0, limit: int = 10, timeout: float | None = None
@@ -121,9 +172,10 @@ class FedditAPIClient:
 
         params = {"subfeddit_id": subfeddit_id, "skip": skip, "limit": limit}
 
-        async with httpx.AsyncClient(timeout=self._choose_timeout(timeout)) as client:
-            response = await client.get(f"{self._base_url}{_API_PREFIX}/comments/", params=params)
-        return _handle_response(response, CommentsResponse).comments
+        response = await self._client.get(
+            _COMMENTS_PATH, params=params, timeout=self._choose_timeout(timeout)
+        )
+        return _handle_response(response, _COMMENTS_ADAPTER)["comments"]
 
     def _choose_timeout(self, provided: float | None) -> float:
         """Choose the timeout value to use for the HTTP request.
@@ -134,38 +186,34 @@ class FedditAPIClient:
         return provided if provided is not None else self._timeout
 
 
-def _handle_response(response: Response, model: type[BaseModel]) -> BaseModel:
+def _handle_response(response: Response, adapter: TypeAdapter[_T]) -> _T:
     """Handle the HTTP response from the API.
 
+    The raw response content is parsed and validated in a single pass by the type adapter.
+
     :param response: The HTTP response object.
-    :param model: The Pydantic model to validate the response against.
+    :param adapter: The type adapter to validate the response against.
     :raises ResponseValidationError: If the response does not match the expected schema.
     :raises BadRequestError: If the status code is 400.
     :raises NotFoundError: If the status code is 404.
     :raises InternalServerError: If the status code is 500.
     :raises UnexpectedError: If the status code is not 200, 400, 404, or 500.
-    :return: The JSON content of the response if the status code is 200.
+    :return: The validated content of the response if the status code is 200.
     """
     logger.debug("Response status code: {}", response.status_code)
 
-    match response.status_code:
-        case 200:
-            content = response.json()
-            logger.debug("Response content: {}", content)
-
-            try:
-                return model.model_validate(content)
-
-            except ValidationError as exc:
-                raise ResponseValidationError(
-                    "Response does not match the expected schema."
-                ) from exc
-
-        case 400:
-            raise BadRequestError(f"Bad Request: {response.text}.")
-        case 404:
-            raise NotFoundError(f"Not Found: {response.text}.")
-        case 500:
-            raise InternalServerError(f"Internal Server Error: {response.text}.")
-        case _:
-            raise UnexpectedError(f"Unexpected Error: {response.status_code} - {response.text}.")
+    if response.status_code == httpx.codes.OK:
+        logger.opt(lazy=True).debug("Response content: {}", lambda: response.text)
+
+        try:
+            return adapter.validate_json(response.content)
+
+        except ValidationError as exc:
+            raise ResponseValidationError("Response does not match the expected schema.") from exc
+
+    error = _STATUS_ERRORS.get(response.status_code)
+    if error is not None:
+        error_type, reason = error
+        raise error_type(f"{reason}: {response.text}.")
+
+    raise UnexpectedError(f"Unexpected Error: {response.status_code} - {response.text}.")
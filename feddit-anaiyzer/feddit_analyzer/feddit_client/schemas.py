@@ -1,6 +1,10 @@
-"""Validation schemas for Feddit client responses."""
+"""Validation schemas for Feddit client responses.
 
-from pydantic import BaseModel, Field
+The client validates the lists of comments and subfeddits directly, so the schemas of the whole
+list responses are only built on first use.
+"""
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class CommentInfo(BaseModel):
@@ -17,6 +21,8 @@ class CommentInfo(BaseModel):
 class CommentsResponse(BaseModel):
     """Model representing the response schema for comments."""
 
+    model_config = ConfigDict(defer_build=True)
+
     subfeddit_id: int = Field(
         ..., title="Subfeddit Id", description="ID of the subfeddit, to which the comments belong."
     )
@@ -39,6 +45,8 @@ class SubfedditInfo(BaseModel):
 class SubfedditsResponse(BaseModel):
     """Model representing the response schema for a list of subfeddits."""
 
+    model_config = ConfigDict(defer_build=True)
+
     limit: int = Field(10, title="Limit", description="Max number of returning subfeddits.")
     skip: int = Field(0, title="Skip", description="Number of subfeddits to skip.")
     subfeddits: list[SubfedditInfo] = Field(
@@ -63,4 +71,6 @@ class SubfedditResponse(BaseModel):
 class VersionResponse(BaseModel):
     """Model representing the response schema for the version endpoint."""
 
+    model_config = ConfigDict(defer_build=True)
+
     version: str = Field(..., title="Version", description="Version of the API", examples=["0.1.0"])
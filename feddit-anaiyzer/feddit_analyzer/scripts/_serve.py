@@ -1,38 +1,58 @@
 """Script to serve the API."""
 
+import os
+import sys
+
 import click
 import uvicorn
+from loguru import logger
 
 
 @click.command("serve")
 @click.option("--host", default="127.0.0.1", help="Host to serve the API on.", type=str)
 @click.option("--port", default=8000, help="Port to serve the API on.", type=int)
 @click.option("--reload", is_flag=True, help="Enable auto-reload for development.")
+@click.option(
+    "--workers",
+    default=1,
+    help="Number of worker processes. Ignored when auto-reload is enabled.",
+    type=click.IntRange(min=1),
+)
 @click.option(
     "--log-level",
     default="info",
-    help="Log level for the server.",
+    help="Log level for the server and the application.",
     type=click.Choice(
         ["critical", "error", "warning", "info", "debug", "trace"], case_sensitive=False
     ),
 )
-def serve(host: str, port: int, reload: bool, log_level: str) -> None:
+def serve(host: str, port: int, reload: bool, workers: int, log_level: str) -> None:
     """Serve the API.
 
     Requires the definition of the following environment variables: FEDDIT_API_BASE_URL and
     HUGGINGFACE_API_KEY.
 
+    The server runs on uvloop and parses HTTP with httptools when they are installed. uvloop is
+    not available on Windows. Each worker process keeps its own caches.
+
     \f
 
     :param host: Host to serve the API on.
     :param port: Port to serve the API on.
     :param reload: Enable auto-reload for development.
+    :param workers: Number of worker processes. Ignored when auto-reload is enabled.
     :param log_level: Log level for the server.
     """
+    # Worker and reloader processes configure loguru from the environment when importing it.
+    os.environ["LOGURU_LEVEL"] = log_level.upper()
+    logger.remove()
+    logger.add(sys.stderr, level=log_level.upper())
+
     uvicorn.run(
         "feddit_analyzer.api:app",
         host=host,
         port=port,
         reload=reload,
+        workers=1 if reload else workers,
         log_level=log_level,
     )
@@ -1,53 +1,77 @@
 """Script to wait for the API to be up and running."""
 
+import asyncio
 import sys
-import time
 
 import click
-import requests
+import httpx
+import orjson
 from loguru import logger
-from requests.exceptions import HTTPError, RequestException
 
 from feddit_analyzer.feddit_client import FedditAPIClient
-from feddit_analyzer.feddit_client.schemas import VersionResponse
+
+_INITIAL_BACKOFF = 0.5
 
 
 @click.command("wait-api")
 @click.argument("base-url", required=True, type=str)
 @click.option("--timeout", default=10, help="Timeout in seconds.", type=float)
-@click.option("--wait", default=10, help="Wait time in seconds.", type=float)
-@click.option("--retries", default=3, help="Number of retries.", type=int)
+@click.option(
+    "--wait", default=10, help="Maximum wait time between retries in seconds.", type=float
+)
+@click.option("--retries", default=7, help="Number of retries.", type=int)
 def wait_api(base_url: str, timeout: float, wait: float, retries: int) -> None:
     """Wait for the API to be up and running.
 
+    The wait time between retries starts at half a second and doubles after each failed attempt,
+    up to the given maximum wait time.
+
     \f
 
     :param base_url: Base URL of the API.
     :param timeout: Timeout in seconds.
-    :param wait: Wait time in seconds.
+    :param wait: Maximum wait time between retries in seconds.
+    :param retries: Number of retries.
+    """
+    sys.exit(0 if asyncio.run(_wait_api(base_url, timeout, wait, retries)) else 1)
+
+
+async def _wait_api(base_url: str, timeout: float, wait: float, retries: int) -> bool:
+    """Check the API version until the API responds or the retries are exhausted.
+
+    :param base_url: Base URL of the API.
+    :param timeout: Timeout in seconds.
+    :param wait: Maximum wait time between retries in seconds.
     :param retries: Number of retries.
+    :return: Whether the API is up and running.
     """
-    attempts = 0
     logger.info("Checking if the API is up and running on {}", base_url)
-    while attempts < retries:
-        try:
-            logger.info("Attempt {} of {}", attempts + 1, retries)
-            response = requests.get(f"{base_url}/api/v1/version", timeout=timeout)
-
-            response.raise_for_status()
-            version = VersionResponse.model_validate(response.json()).version
-            if version in FedditAPIClient.VALID_VERSIONS:
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        for attempt in range(retries):
+            logger.info("Attempt {} of {}", attempt + 1, retries)
+
+            try:
+                response = await client.get("/api/v1/version")
+                response.raise_for_status()
+                content = orjson.loads(response.content)
+
+            except (httpx.HTTPError, orjson.JSONDecodeError) as exc:
+                logger.info("API is not up and running: {}", exc)
+
+                if attempt + 1 < retries:
+                    await asyncio.sleep(min(wait, _INITIAL_BACKOFF * 2**attempt))
+
+                continue
+
+            version = content.get("version") if isinstance(content, dict) else None
+            if isinstance(version, str) and version in FedditAPIClient.VALID_VERSIONS:
                 logger.info("API is has a valid version: {}", version)
             else:
                 logger.warning("API version {} is not supported.", version)
 
             logger.info("API is up and running at {}.", base_url)
-            sys.exit(0)
-
-        except (RequestException, HTTPError) as exc:
-            logger.info("API is not up and running: {}", exc)
-            time.sleep(wait)
-            attempts += 1
+            return True
 
     logger.error("API is not up and running after {} attempts.", retries)
-    sys.exit(1)
+    return False
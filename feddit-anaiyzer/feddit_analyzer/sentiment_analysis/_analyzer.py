@@ -1,23 +1,39 @@
 """Core sentiment analysis functionality wrapped into ``SentimentAnalyzer`` for more adequate
 outputs."""
 
+import asyncio
+import itertools
 import os
+from types import TracebackType
+from typing import Self
 
 import httpx
+import orjson
 from httpx import Response
 from loguru import logger
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from .errors import (
     BadRequestError,
     InternalServerError,
+    ModelAPIError,
     NotFoundError,
     ResponseValidationError,
     UnexpectedError,
 )
-from .schemas import ModelResponse, SentimentAnalysis, SentimentScore
+from .schemas import SENTIMENT_LABELS, SentimentAnalysis, SentimentScore
 from .sentiment import Sentiment
 
+_STATUS_ERRORS: dict[int, tuple[type[ModelAPIError], str]] = {
+    400: (BadRequestError, "Bad Request"),
+    404: (NotFoundError, "Not Found"),
+    500: (InternalServerError, "Internal Server Error"),
+}
+_LABEL_INDEX = {"negative": 0, "neutral": 1, "positive": 2}
+_MAX_STATEMENTS_PER_REQUEST = 16
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_OUTPUTS_ADAPTER = TypeAdapter(list[list[SentimentScore]])
+
 
 class SentimentAnalyzer:
     """Model wrapper for sentiment analysis. Normalizes multilabeled outputs into a single polarity
@@ -32,41 +48,103 @@ class SentimentAnalyzer:
     specific model. It does not make sense to change the model without changing the implementation
     though a configuration file or similar.
 
+    The HTTP connections to the model API are kept alive and reused across requests until the
+    analyzer is closed with ``aclose`` or by using it as an asynchronous context manager.
+
     :param timeout: Default timeout for the HTTP request to the model in seconds. Default is 10
         seconds.
+    :param max_concurrency: Maximum number of concurrent requests to the model. Default is 8.
+    :raises RuntimeError: If the environment variable ``HUGGINGFACE_API_KEY`` is not set.
     """
 
     _MODEL_API_URL: str = (
         "https://api-inference.huggingface.co/models/cardiffnlp/twitter-roberta-base-sentiment-latest"
     )
 
-    def __init__(self, timeout: float = 10) -> None:
+    def __init__(self, timeout: float = 10, max_concurrency: int = 8) -> None:
         self._timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        try:
+            api_key = os.environ["HUGGINGFACE_API_KEY"]
+        except KeyError as exc:
+            raise RuntimeError("Environment variable HUGGINGFACE_API_KEY is not set.") from exc
+
+        self._client = httpx.AsyncClient(
+            timeout=timeout, headers={"Authorization": f"Bearer {api_key}"}
+        )
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the HTTP connections to the model API."""
+        await self._client.aclose()
 
     async def analyze_sentiment(
         self, statements: str | list[str], timeout: float | None = None
-    ) -> ModelResponse:
+    ) -> list[SentimentAnalysis]:
         """Analyze the sentiment of the given statements.
 
+        Statements are sent to the model in chunks of at most ``_MAX_STATEMENTS_PER_REQUEST``
+        statements, which are requested concurrently.
+
         :param statements: The statements to analyze the sentiment of.
         :param timeout: Timeout for the HTTP request in seconds. If not provided, the client default
             timeout will be used. Default is ``None``.
-        :return: The sentiment scores of the statements in the order they are given.
+        :return: The sentiment analysis of the statements in the order they are given.
         """
-        n_statements = len(statements) if isinstance(statements, list) else 1
+        statement_list = [statements] if isinstance(statements, str) else statements
+
+        logger.info("Generating sentiment analysis for {} statements.", len(statement_list))
+
+        if len(statement_list) <= _MAX_STATEMENTS_PER_REQUEST:
+            model_response = await self._request_sentiment(statements, timeout)
+        else:
+            chunk_responses = await asyncio.gather(
+                *(
+                    self._request_sentiment(
+                        statement_list[start : start + _MAX_STATEMENTS_PER_REQUEST], timeout
+                    )
+                    for start in range(0, len(statement_list), _MAX_STATEMENTS_PER_REQUEST)
+                )
+            )
+            model_response = list(itertools.chain.from_iterable(chunk_responses))
 
-        logger.info("Generating sentiment analysis for {} statements.", n_statements)
+        outputs = _process_outputs(statement_list, model_response)
+        logger.info("Sentiment analysis generated for {} statements.", len(statement_list))
 
-        model_response = await self._request_sentiment(statements, timeout)
+        return outputs
 
-        outputs = _process_outputs(statements, model_response)
-        logger.info("Sentiment analysis generated for {} statements.", n_statements)
+    async def analyze_sentiment_batch(
+        self, batches: list[list[str]], timeout: float | None = None
+    ) -> list[list[SentimentAnalysis]]:
+        """Analyze the sentiment of several batches of statements concurrently.
 
-        return outputs
+        Each batch is analyzed as with ``analyze_sentiment``, so it is sent to the model in its
+        own requests of at most ``_MAX_STATEMENTS_PER_REQUEST`` statements. At most
+        ``max_concurrency`` requests are in flight at once.
+
+        :param batches: The batches of statements to analyze the sentiment of.
+        :param timeout: Timeout for each HTTP request in seconds. If not provided, the client
+            default timeout will be used. Default is ``None``.
+        :return: The sentiment analysis of each batch in the order they are given.
+        """
+        return list(
+            await asyncio.gather(*(self.analyze_sentiment(batch, timeout) for batch in batches))
+        )
 
     async def _request_sentiment(
         self, statements: str | list[str], timeout: float | None = None
-    ) -> list[SentimentScore]:
+    ) -> list[list[SentimentScore]]:
         """Request inference the sentiment of the given statements.
 
         :param statements: The statements to infer the sentiment of.
@@ -74,14 +152,15 @@ class SentimentAnalyzer:
             client default timeout will be used. Default is ``None``.
         :return: The sentiment scores of the statements in the order they are given.
         """
-        async with httpx.AsyncClient(timeout=self._choose_timeout(timeout)) as client:
-            response = await client.post(
+        async with self._semaphore:
+            response = await self._client.post(
                 self._MODEL_API_URL,
-                json={"inputs": statements},
-                headers={"Authorization": f"Bearer {os.environ['HUGGINGFACE_API_KEY']}"},
+                content=orjson.dumps({"inputs": statements}),
+                headers=_JSON_HEADERS,
+                timeout=self._choose_timeout(timeout),
             )
 
-        return _handle_response(response).outputs
+        return _handle_response(response)
 
     def _choose_timeout(self, provided: float | None) -> float:
         """Choose the timeout value to use for the HTTP request.
@@ -92,7 +171,7 @@ class SentimentAnalyzer:
         return provided if provided is not None else self._timeout
 
 
-def _handle_response(response: Response) -> ModelResponse:
+def _handle_response(response: Response) -> list[list[SentimentScore]]:
     """Handle the HTTP response from the model API.
 
     :param response: The HTTP response object.
@@ -101,35 +180,50 @@ def _handle_response(response: Response) -> ModelResponse:
     :raises NotFoundError: If the status code is 404.
     :raises InternalServerError: If the status code is 500.
     :raises UnexpectedError: If the status code is not 200, 400, 404, or 500.
-    :return: The JSON content of the response if the status code is 200.
+    :return: The sentiment scores of each statement if the status code is 200.
     """
     logger.debug("Response status code: {}", response.status_code)
 
-    match response.status_code:
-        case 200:
-            content = response.json()
-            logger.debug("Response content: {}", content)
+    if response.status_code == httpx.codes.OK:
+        logger.opt(lazy=True).debug("Response content: {}", lambda: response.text)
 
-            try:
-                return ModelResponse.model_validate({"outputs": content})
+        try:
+            outputs = _OUTPUTS_ADAPTER.validate_json(response.content)
 
-            except (ValidationError, ValueError) as exc:
-                raise ResponseValidationError(
-                    "Response does not match the expected schema or values."
-                ) from exc
+        except ValidationError as exc:
+            raise ResponseValidationError(
+                "Response does not match the expected schema or values."
+            ) from exc
 
-        case 400:
-            raise BadRequestError(f"Bad Request: {response.text}.")
-        case 404:
-            raise NotFoundError(f"Not Found: {response.text}.")
-        case 500:
-            raise InternalServerError(f"Internal Server Error: {response.text}.")
-        case _:
-            raise UnexpectedError(f"Unexpected Error: {response.status_code} - {response.text}.")
+        if not all(_has_all_labels(scores) for scores in outputs):
+            raise ResponseValidationError(
+                "Outputs must contain the three labels: positive, negative, and neutral."
+            )
+
+        return outputs
+
+    error = _STATUS_ERRORS.get(response.status_code)
+    if error is not None:
+        error_type, reason = error
+        raise error_type(f"{reason}: {response.text}.")
+
+    raise UnexpectedError(f"Unexpected Error: {response.status_code} - {response.text}.")
+
+
+def _has_all_labels(scores: list[SentimentScore]) -> bool:
+    """Check that the scores of a statement contain each label exactly once.
+
+    :param scores: The scores of a statement.
+    :return: Whether the scores contain the three labels: positive, negative, and neutral.
+    """
+    return (
+        len(scores) == len(SENTIMENT_LABELS)
+        and {score["label"] for score in scores} == SENTIMENT_LABELS
+    )
 
 
 def _process_outputs(
-    statements: str | list[str], outputs: list[SentimentScore]
+    statements: list[str], outputs: list[list[SentimentScore]]
 ) -> list[SentimentAnalysis]:
     """Parse the model outputs into a list of sentiment analysis.
 
@@ -137,24 +231,26 @@ def _process_outputs(
     :param outputs: The model outputs to parse.
     :return: The sentiment analysis for each output provided by the models.
     """
-    if isinstance(statements, str):
-        statements = [statements]
-
     return [
         _analyze_output(statement, output)
         for statement, output in zip(statements, outputs, strict=False)
     ]
 
 
-def _analyze_output(statement: str, output: SentimentScore) -> SentimentAnalysis:
+def _analyze_output(statement: str, output: list[SentimentScore]) -> SentimentAnalysis:
     """Analyze the output of the model and return a sentiment analysis.
 
     :param statement: The statement that was analyzed.
     :param output: The output of the model.
     :return: The sentiment analysis of the output.
     """
-    scores = {score.label: score.score for score in output}
-    polarity = _compute_polarity(scores["positive"], scores["neutral"], scores["negative"])
+    scores = [0.0] * len(_LABEL_INDEX)
+    for score in output:
+        scores[_LABEL_INDEX[score["label"]]] = score["score"]
+
+    negative, neutral, positive = scores
+    polarity = _compute_polarity(positive, neutral, negative)
+
     return SentimentAnalysis(
         statement=statement, polarity=polarity, sentiment=Sentiment.from_polarity(polarity)
     )
@@ -1,79 +1,40 @@
-"""Module containing the Pydantic models for the sentiment analysis model API and analyzer
-outputs."""
+"""Module containing the schemas for the sentiment analysis model API and analyzer outputs."""
 
-from pydantic import BaseModel, Field, ValidationError, field_validator
+from dataclasses import dataclass
+from typing import Annotated, Literal
 
-from .sentiment import Sentiment
-
-_NLABELS = 3
-
-
-class SentimentScore(BaseModel):
-    """Model representing the response schema for sentiment score."""
-
-    label: str = Field(..., title="Label", description="Sentiment label.")
-    score: float = Field(..., title="Score", description="Sentiment score.")
+from pydantic import Field
+from typing_extensions import TypedDict  # Pydantic requires it for Python < 3.12
 
-    @field_validator("score")
-    @classmethod
-    def _score_must_be_between_0_and_1(cls, value: float) -> float:
-        """Validate that the score is between 0 and 1.
-
-        :param value: The score value to validate.
-        :raises ValueError: If the score is not between 0 and 1.
-        :return: The score value if it is valid.
-        """
-        if not (0 <= value <= 1):
-            raise ValueError("Score must be between 0 and 1")
-        return value
-
-
-class ModelResponse(BaseModel):
-    """Model representing the response schema for model response."""
+from .sentiment import Sentiment
 
-    outputs: list[list[SentimentScore]] = Field(..., title="Outputs", description="Model outputs.")
+SENTIMENT_LABELS = frozenset({"positive", "negative", "neutral"})
 
-    @field_validator("outputs")
-    @classmethod
-    def _validate_required_labels(
-        cls, value: list[list[SentimentScore]]
-    ) -> list[list[SentimentScore]]:
-        """Validate that the outputs contains the three labels: positive, negative, and neutral.
 
-        :param value: The outputs to validate.
-        :raises ValueError: If the outputs do not contain the three labels.
-        :return: The outputs if they are valid.
-        """
-        for scores in value:
-            if len(scores) != _NLABELS or {score.label for score in scores} != {
-                "positive",
-                "negative",
-                "neutral",
-            }:
-                raise ValidationError(
-                    "Outputs must contain the three labels: positive, negative, and neutral"
-                )
+class SentimentScore(TypedDict):
+    """Schema of a single label score returned by the model API.
 
-        return value
+    Scores are plain dictionaries validated as a whole batch through a ``TypeAdapter``, as the model
+    API response is parsed on every analysis and does not need model instances.
+    """
 
+    label: Literal["positive", "negative", "neutral"]
+    score: Annotated[float, Field(ge=0, le=1)]
 
-class SentimentAnalysis(BaseModel):
-    """Model representing the request schema for sentiment analysis."""
 
-    statement: str = Field(..., title="Statement", description="The statement to analyze.")
-    polarity: float = Field(..., title="Polarity", description="The polarity of the query.")
-    sentiment: Sentiment = Field(..., title="Sentiment", description="The sentiment of the query.")
+@dataclass(slots=True, frozen=True)
+class SentimentAnalysis:
+    """Sentiment analysis of a statement, as returned by ``SentimentAnalyzer``.
 
-    @field_validator("polarity")
-    @classmethod
-    def _polarity_must_be_between_minus_1_and_1(cls, value: float) -> float:
-        """Validate that the polarity is between -1 and 1.
+    It is a plain dataclass rather than a Pydantic model, as it is only built by the analyzer
+    from already validated model outputs and never parsed from untrusted input. The polarity range
+    is enforced by ``Sentiment.from_polarity`` when the sentiment is derived.
 
-        :param value: The polarity value to validate.
-        :raises ValueError: If the polarity is not between -1 and 1.
-        :return: The polarity value if it is valid.
-        """
-        if not (-1 <= value <= 1):
-            raise ValueError("Polarity must be between -1 and 1")
+    :param statement: The statement analyzed.
+    :param polarity: The polarity of the statement, between -1 and 1.
+    :param sentiment: The sentiment of the statement.
+    """
 
-        return value
+    statement: str
+    polarity: float
+    sentiment: Sentiment
@@ -21,9 +21,16 @@ class Sentiment(StrEnum):
         The split threshold is 0, as polarity values are between -1 and 1.
 
         :param polarity: The polarity value to convert.
+        :raises InvalidPolarityError: If the polarity is not between -1 and 1, including ``nan``.
         :return: The corresponding sentiment value.
         """
         if not -1 <= polarity <= 1:
             raise InvalidPolarityError(polarity)
 
-        return cls.POSITIVE if polarity >= _POL_TH else cls.NEGATIVE
+        return _POSITIVE if polarity >= _POL_TH else _NEGATIVE
+
+
+# Module level aliases so ``from_polarity``, called once per analyzed statement, avoids the enum
+# member lookups.
+_POSITIVE = Sentiment.POSITIVE
+_NEGATIVE = Sentiment.NEGATIVE
@@ -1 +1,19 @@
 """Fixtures used across data, e2e, integration and unit tests."""
+
+import asyncio
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Fixture for the event loop policy of async tests, uvloop when available as when served."""
+    if uvloop is None:
+        return asyncio.DefaultEventLoopPolicy()
+
+    return uvloop.EventLoopPolicy()
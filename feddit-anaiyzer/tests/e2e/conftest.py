@@ -1 +1,15 @@
 """Fixtures for e2e tests."""
+
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from feddit_analyzer.api import app
+
+
+@pytest.fixture(scope="session")
+def test_client() -> Iterator[TestClient]:
+    """Fixture for the API test client. The app lifespan runs once for the whole session."""
+    with TestClient(app) as client:
+        yield client
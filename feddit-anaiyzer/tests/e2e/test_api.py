@@ -2,27 +2,21 @@
 
 import os
 
-import pytest
 from fastapi.testclient import TestClient
 
-from feddit_analyzer.api import app
 from feddit_analyzer.feddit_client import FedditAPIClient
 
 
-@pytest.mark.asyncio()
-async def test_e2e_sentiment_analysis() -> None:
+async def test_e2e_sentiment_analysis(test_client: TestClient) -> None:
     """Test the sentiment analysis endpoints."""
-    client = TestClient(app)
-
-    feddit_client = FedditAPIClient(os.environ["FEDDIT_API_BASE_URL"])
-
-    subfeddits = await feddit_client.get_subfeddits(0, 1)
+    async with FedditAPIClient(os.environ["FEDDIT_API_BASE_URL"]) as feddit_client:
+        subfeddits = await feddit_client.get_subfeddits(0, 1)
 
     assert len(subfeddits) == 1, "This test requires at least one subfeddit."
 
     subfeddit = subfeddits[0]
 
-    response = client.post(
+    response = test_client.post(
         "/api/v1/classify_comments/subfeddit_id",
         json={
             "subfeddit_id": subfeddit.id,
@@ -38,7 +32,7 @@ async def test_e2e_sentiment_analysis() -> None:
     assert "comments" in response_data
     assert len(response_data["comments"]) <= 25
 
-    response = client.post(
+    response = test_client.post(
         "/api/v1/classify_comments/subfeddit_title",
         json={"subfeddit_title": subfeddit.title, "sort_by_polarity": False},
     )
@@ -49,7 +43,7 @@ async def test_e2e_sentiment_analysis() -> None:
     assert "comments" in response_data
     assert len(response_data["comments"]) <= 25
 
-    response = client.post(
+    response = test_client.post(
         "/api/v1/classify_comments/subfeddit_title",
         json={"subfeddit_title": subfeddit.title, "sort_by_polarity": True},
     )
@@ -62,7 +56,7 @@ async def test_e2e_sentiment_analysis() -> None:
     sorted_comments = response.json()["comments"]
     polarities = [comment["polarity"] for comment in sorted_comments]
     assert polarities == sorted(polarities, reverse=True)
-    response = client.post(
+    response = test_client.post(
         "/api/v1/classify_comments/subfeddit_id",
         json={
             "subfeddit_id": subfeddit.id,
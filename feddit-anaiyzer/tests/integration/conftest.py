@@ -1,6 +1,7 @@
 """Fixtures for integration tests."""
 
 import os
+from collections.abc import AsyncIterator
 
 import pytest_asyncio
 
@@ -9,12 +10,18 @@ from feddit_analyzer.sentiment_analysis import SentimentAnalyzer
 
 
 @pytest_asyncio.fixture
-def sentiment_analyzer() -> SentimentAnalyzer:
+async def sentiment_analyzer() -> AsyncIterator[SentimentAnalyzer]:
     """Fixture for the SentimentAnalyzer."""
-    return SentimentAnalyzer(120)
+    async with SentimentAnalyzer(120) as analyzer:
+        yield analyzer
 
 
-@pytest_asyncio.fixture
-async def feddit_client() -> FedditAPIClient:
-    """Fixture for the Feddit API client."""
-    return FedditAPIClient(os.environ["FEDDIT_API_BASE_URL"], 120)
+@pytest_asyncio.fixture(scope="session")
+async def feddit_client() -> AsyncIterator[FedditAPIClient]:
+    """Fixture for the Feddit API client, shared by the whole session.
+
+    Tests using it have to run in the session event loop, by marking them with
+    ``pytest.mark.asyncio(scope="session")``.
+    """
+    async with FedditAPIClient(os.environ["FEDDIT_API_BASE_URL"], 120) as client:
+        yield client
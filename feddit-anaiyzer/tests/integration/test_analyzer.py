@@ -20,7 +20,6 @@ from feddit_analyzer.sentiment_analysis.errors import (
 from feddit_analyzer.sentiment_analysis.schemas import SentimentAnalysis
 
 
-@pytest.mark.asyncio()
 async def test_analyze_sentiment_success(sentiment_analyzer: SentimentAnalyzer) -> None:
     """Test analyzing sentiment successfully with real API."""
     statements = ["I love this!", "This is bad.", "I feel neutral."]
@@ -35,7 +34,6 @@ async def test_analyze_sentiment_success(sentiment_analyzer: SentimentAnalyzer)
     assert all(-1 <= res.polarity <= 1 for res in result)
 
 
-@pytest.mark.asyncio()
 async def test_analyze_sentiment_single_statement(sentiment_analyzer: SentimentAnalyzer) -> None:
     """Test analyzing sentiment of a single statement."""
     statement = "This is a test statement."
@@ -46,14 +44,12 @@ async def test_analyze_sentiment_single_statement(sentiment_analyzer: SentimentA
     assert result[0].sentiment in ["positive", "negative"]
 
 
-@pytest.mark.asyncio()
 async def test_analyze_sentiment_bad_request(sentiment_analyzer: SentimentAnalyzer) -> None:
     """Test handling a 400 Bad Request error with real API."""
     with pytest.raises(BadRequestError):
         await sentiment_analyzer.analyze_sentiment([])
 
 
-@pytest.mark.asyncio()
 async def test_analyze_sentiment_not_found(sentiment_analyzer: SentimentAnalyzer) -> None:
     """Test handling a 404 Not Found error with real API."""
     sentiment_analyzer._MODEL_API_URL = (
@@ -63,7 +59,6 @@ async def test_analyze_sentiment_not_found(sentiment_analyzer: SentimentAnalyzer
         await sentiment_analyzer.analyze_sentiment("Test statement")
 
 
-@pytest.mark.asyncio()
 async def test_easy_to_discern_statements(sentiment_analyzer: SentimentAnalyzer) -> None:
     """Test analyzing sentiment of easy-to-discern statements.
 
@@ -1,5 +1,7 @@
 """Integration tests for the Feddit API client."""
 
+import asyncio
+
 import pytest
 
 from feddit_analyzer.feddit_client import FedditAPIClient
@@ -9,21 +11,22 @@ from feddit_analyzer.feddit_client.schemas import (
     SubfedditResponse,
 )
 
+pytestmark = pytest.mark.asyncio(scope="session")
+
+_SUBFEDDIT_IDS = (1, 2, 3)
+
 
-@pytest.mark.asyncio()
 async def test_get_version_success(feddit_client: FedditAPIClient) -> None:
     """Test getting the API version."""
     version = await feddit_client.get_version()
     assert version == "0.1.0"
 
 
-@pytest.mark.asyncio()
 async def check_version(feddit_client: FedditAPIClient) -> None:
     """Test API version is supported."""
     await feddit_client.check_version()
 
 
-@pytest.mark.asyncio()
 async def test_get_subfeddits_success(feddit_client: FedditAPIClient) -> None:
     """Test getting a list of subfeddits."""
     subfeddits = await feddit_client.get_subfeddits()
@@ -32,26 +35,26 @@ async def test_get_subfeddits_success(feddit_client: FedditAPIClient) -> None:
     assert all(isinstance(subfeddit, SubfedditInfo) for subfeddit in subfeddits)
 
 
-@pytest.mark.asyncio()
-@pytest.mark.parametrize("subfeddit_id", [1, 2, 3])
-async def test_get_subfeddit_info_success(
-    feddit_client: FedditAPIClient, subfeddit_id: int
-) -> None:
-    """Test getting detailed information of a specific subfeddit."""
-    subfeddit = await feddit_client.get_subfeddit_info(subfeddit_id)
-    assert isinstance(subfeddit, SubfedditResponse)
-    assert subfeddit.id == subfeddit_id
-    assert len(subfeddit.comments) > 0
-    assert all(isinstance(comment, CommentInfo) for comment in subfeddit.comments)
-
-
-@pytest.mark.asyncio()
-@pytest.mark.parametrize("subfeddit_id", [1, 2, 3])
-async def test_get_subfeddit_comments_success(
-    feddit_client: FedditAPIClient, subfeddit_id: int
-) -> None:
-    """Test getting comments for a specific subfeddit."""
-    comments = await feddit_client.get_subfeddit_comments(subfeddit_id)
-    assert isinstance(comments, list)
-    assert len(comments) > 0
-    assert all(isinstance(comment, CommentInfo) for comment in comments)
+async def test_get_subfeddit_info_success(feddit_client: FedditAPIClient) -> None:
+    """Test getting detailed information of specific subfeddits, requested concurrently."""
+    subfeddits = await asyncio.gather(
+        *(feddit_client.get_subfeddit_info(subfeddit_id) for subfeddit_id in _SUBFEDDIT_IDS)
+    )
+
+    for subfeddit_id, subfeddit in zip(_SUBFEDDIT_IDS, subfeddits, strict=True):
+        assert isinstance(subfeddit, SubfedditResponse)
+        assert subfeddit.id == subfeddit_id
+        assert len(subfeddit.comments) > 0
+        assert all(isinstance(comment, CommentInfo) for comment in subfeddit.comments)
+
+
+async def test_get_subfeddit_comments_success(feddit_client: FedditAPIClient) -> None:
+    """Test getting comments for specific subfeddits, requested concurrently."""
+    subfeddits_comments = await asyncio.gather(
+        *(feddit_client.get_subfeddit_comments(subfeddit_id) for subfeddit_id in _SUBFEDDIT_IDS)
+    )
+
+    for comments in subfeddits_comments:
+        assert isinstance(comments, list)
+        assert len(comments) > 0
+        assert all(isinstance(comment, CommentInfo) for comment in comments)
@@ -1,10 +1,15 @@
 """Fixtures for unit tests."""
 
 import random
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
+import pytest
 import pytest_asyncio
 
+from feddit_analyzer.api import _core
+from feddit_analyzer.api._core import sentiment_cache, subfeddit_cache
 from feddit_analyzer.feddit_client import FedditAPIClient
 from feddit_analyzer.feddit_client.schemas import CommentInfo
 from feddit_analyzer.sentiment_analysis import SentimentAnalyzer
@@ -12,14 +17,22 @@ from feddit_analyzer.sentiment_analysis.schemas import SentimentAnalysis
 from feddit_analyzer.sentiment_analysis.sentiment import Sentiment
 
 
-@pytest_asyncio.fixture
-async def suffedit_title() -> str:
+@pytest.fixture(autouse=True)
+def _clear_caches() -> None:
+    """Fixture to clear the API core caches before each test."""
+    subfeddit_cache.clear()
+    sentiment_cache.clear()
+    _core._subfeddit_index.invalidate()
+
+
+@pytest_asyncio.fixture(scope="session")
+def suffedit_title() -> str:
     """Fixture for the title of a subfeddit."""
     return "existing_subfeddit"
 
 
-@pytest_asyncio.fixture
-async def subfeddit_id() -> int:
+@pytest_asyncio.fixture(scope="session")
+def subfeddit_id() -> int:
     """Fixture for the ID of a subfeddit."""
     return 123
 
@@ -71,26 +84,44 @@ async def sentiments() -> list[SentimentAnalysis]:
     ]
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(scope="session")
 def feddit_base_url() -> str:
     """Base fake URL for unit tests."""
     return "http://fake.url"
 
 
-@pytest_asyncio.fixture
-def feddit_client(feddit_base_url: str) -> FedditAPIClient:
-    """Fixture for the Feddit API client."""
-    return FedditAPIClient(feddit_base_url)
+@pytest_asyncio.fixture(scope="session")
+def feddit_urls(feddit_base_url: str) -> SimpleNamespace:
+    """URLs of the fake Feddit API endpoints, without query parameters."""
+    api_url = f"{feddit_base_url}/api/v1"
+    return SimpleNamespace(
+        version=f"{api_url}/version",
+        subfeddits=f"{api_url}/subfeddits/",
+        subfeddit=f"{api_url}/subfeddit/",
+        comments=f"{api_url}/comments/",
+    )
+
+
+@pytest_asyncio.fixture(scope="session")
+async def feddit_client(feddit_base_url: str) -> AsyncIterator[FedditAPIClient]:
+    """Fixture for the Feddit API client, shared by the whole session.
+
+    Tests using it have to run in the session event loop, by marking them with
+    ``pytest.mark.asyncio(scope="session")``.
+    """
+    async with FedditAPIClient(feddit_base_url) as client:
+        yield client
 
 
 @pytest_asyncio.fixture
-def sentiment_analyzer(monkeypatch: callable) -> SentimentAnalyzer:
+async def sentiment_analyzer(monkeypatch: callable) -> AsyncIterator[SentimentAnalyzer]:
     """Fixture for the SentimentAnalyzer."""
     monkeypatch.setenv("HUGGINGFACE_API_KEY", "fake_api_key")
-    return SentimentAnalyzer()
+    async with SentimentAnalyzer() as analyzer:
+        yield analyzer
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(scope="session")
 def mock_model_response() -> callable:
     """Fixture to return a mock model response with random values."""
 
@@ -1,6 +1,10 @@
 """Unit tests for the ``SentimentAnalyzer``."""
 
+import json
+
+import httpx
 import pytest
+from pydantic import ValidationError
 from pytest_httpx import HTTPXMock
 
 from feddit_analyzer.sentiment_analysis import SentimentAnalyzer
@@ -13,7 +17,42 @@ from feddit_analyzer.sentiment_analysis.errors import (
 )
 
 
-@pytest.mark.asyncio()
+async def test_analyze_sentiment_batch_success(
+    sentiment_analyzer: SentimentAnalyzer, httpx_mock: HTTPXMock, mock_model_response: callable
+) -> None:
+    """Test analyzing sentiment of several batches of statements."""
+    batches = [["I love this!", "This is bad."], ["This is fine."]]
+
+    def _respond(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=mock_model_response(json.loads(request.content)["inputs"]))
+
+    httpx_mock.add_callback(_respond, url=SentimentAnalyzer._MODEL_API_URL)
+
+    result = await sentiment_analyzer.analyze_sentiment_batch(batches)
+
+    assert [[res.statement for res in batch_result] for batch_result in result] == batches
+    assert len(httpx_mock.get_requests()) == len(batches)
+
+
+async def test_analyze_sentiment_batch_large_batch(
+    sentiment_analyzer: SentimentAnalyzer, httpx_mock: HTTPXMock, mock_model_response: callable
+) -> None:
+    """Test batches with more statements than a single request can hold are split."""
+    batches = [[f"Statement {index}" for index in range(17)], ["This is fine."]]
+
+    def _respond(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=mock_model_response(json.loads(request.content)["inputs"]))
+
+    httpx_mock.add_callback(_respond, url=SentimentAnalyzer._MODEL_API_URL)
+
+    result = await sentiment_analyzer.analyze_sentiment_batch(batches)
+
+    assert [[res.statement for res in batch_result] for batch_result in result] == batches
+    assert sorted(
+        len(json.loads(request.content)["inputs"]) for request in httpx_mock.get_requests()
+    ) == [1, 1, 16]
+
+
 async def test_analyze_sentiment_success(
     sentiment_analyzer: SentimentAnalyzer, httpx_mock: HTTPXMock, mock_model_response: callable
 ) -> None:
@@ -29,7 +68,6 @@ async def test_analyze_sentiment_success(
     assert all(res.sentiment in ["positive", "negative"] for res in result)
 
 
-@pytest.mark.asyncio()
 async def test_analyze_sentiment_bad_request(
     sentiment_analyzer: SentimentAnalyzer, httpx_mock: HTTPXMock
 ) -> None:
@@ -43,7 +81,6 @@ async def test_analyze_sentiment_bad_request(
         await sentiment_analyzer.analyze_sentiment(statements)
 
 
-@pytest.mark.asyncio()
 async def test_analyze_sentiment_not_found(
     sentiment_analyzer: SentimentAnalyzer, httpx_mock: HTTPXMock
 ) -> None:
@@ -55,7 +92,6 @@ async def test_analyze_sentiment_not_found(
         await sentiment_analyzer.analyze_sentiment(statements)
 
 
-@pytest.mark.asyncio()
 async def test_analyze_sentiment_internal_server_error(
     sentiment_analyzer: SentimentAnalyzer, httpx_mock: HTTPXMock
 ) -> None:
@@ -69,7 +105,6 @@ async def test_analyze_sentiment_internal_server_error(
         await sentiment_analyzer.analyze_sentiment(statements)
 
 
-@pytest.mark.asyncio()
 async def test_analyze_sentiment_unexpected_error(
     sentiment_analyzer: SentimentAnalyzer, httpx_mock: HTTPXMock
 ) -> None:
@@ -83,22 +118,64 @@ async def test_analyze_sentiment_unexpected_error(
         await sentiment_analyzer.analyze_sentiment(statements)
 
 
-@pytest.mark.asyncio()
+@pytest.mark.parametrize(
+    ("score", "error_type"), [(1.5, "less_than_equal"), (-0.1, "greater_than_equal")]
+)
 async def test_analyze_sentiment_response_validation_error(
-    sentiment_analyzer: SentimentAnalyzer, httpx_mock: HTTPXMock
+    sentiment_analyzer: SentimentAnalyzer, httpx_mock: HTTPXMock, score: float, error_type: str
 ) -> None:
-    """Test handling a response validation error."""
+    """Test handling a response with a score out of the 0 to 1 range."""
     statements = ["Validation error"]
-    invalid_response = {
-        "outputs": [
-            [
-                {"label": "positive", "score": 1.5},
-                {"label": "neutral", "score": -0.1},
-                {"label": "negative", "score": 0.6},
-            ]
+    invalid_response = [
+        [
+            {"label": "positive", "score": score},
+            {"label": "neutral", "score": 0.2},
+            {"label": "negative", "score": 0.6},
         ]
-    }
+    ]
+    httpx_mock.add_response(url=SentimentAnalyzer._MODEL_API_URL, json=invalid_response)
+
+    with pytest.raises(ResponseValidationError) as exc_info:
+        await sentiment_analyzer.analyze_sentiment(statements)
+
+    cause = exc_info.value.__cause__
+    assert isinstance(cause, ValidationError)
+    assert [(error["type"], error["loc"]) for error in cause.errors()] == [
+        (error_type, (0, 0, "score"))
+    ]
+
+
+def test_sentiment_analyzer_missing_api_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the analyzer cannot be created without a Hugging Face API key."""
+    monkeypatch.delenv("HUGGINGFACE_API_KEY", raising=False)
+    with pytest.raises(RuntimeError):
+        SentimentAnalyzer()
+
+
+async def test_analyze_sentiment_missing_label_error(
+    sentiment_analyzer: SentimentAnalyzer, httpx_mock: HTTPXMock
+) -> None:
+    """Test handling a response where a statement lacks one of the three labels."""
+    statements = ["Missing label"]
+    invalid_response = [[{"label": "positive", "score": 0.7}, {"label": "neutral", "score": 0.3}]]
     httpx_mock.add_response(url=SentimentAnalyzer._MODEL_API_URL, json=invalid_response)
 
     with pytest.raises(ResponseValidationError):
         await sentiment_analyzer.analyze_sentiment(statements)
+
+
+async def test_analyze_sentiment_chunked(
+    sentiment_analyzer: SentimentAnalyzer, httpx_mock: HTTPXMock, mock_model_response: callable
+) -> None:
+    """Test many statements are sent to the model in several requests and kept in order."""
+    statements = [f"Statement {index}" for index in range(40)]
+
+    def _respond(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=mock_model_response(json.loads(request.content)["inputs"]))
+
+    httpx_mock.add_callback(_respond, url=SentimentAnalyzer._MODEL_API_URL)
+
+    result = await sentiment_analyzer.analyze_sentiment(statements)
+
+    assert [res.statement for res in result] == statements
+    assert len(httpx_mock.get_requests()) > 1
@@ -0,0 +1,195 @@
+"""Unit tests for the error handling and streaming of the API application."""
+
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from feddit_analyzer.api._app import (
+    _handle_error,
+    _stream_sentiments,
+    app,
+    general_exception_handler,
+    get_feddit_api_client,
+    get_sentiment_analyzer,
+)
+from feddit_analyzer.api._schemas import CommentSentiment, ErrorResponse
+from feddit_analyzer.feddit_client import FedditAPIClient
+from feddit_analyzer.feddit_client.errors import APIClientError, SubfedditNotFoundError
+from feddit_analyzer.feddit_client.errors import NotFoundError as FedditNotFoundError
+from feddit_analyzer.feddit_client.schemas import CommentInfo
+from feddit_analyzer.sentiment_analysis import SentimentAnalyzer
+from feddit_analyzer.sentiment_analysis.errors import InvalidPolarityError
+from feddit_analyzer.sentiment_analysis.schemas import SentimentAnalysis
+
+_COMMENTS_ID_PATH = "/api/v1/classify_comments/subfeddit_id"
+
+
+class _CustomNotFoundError(FedditNotFoundError):
+    """Feddit API error without a dedicated error response."""
+
+
+@pytest.mark.parametrize(
+    ("exc", "status_code", "message"),
+    [
+        (
+            SubfedditNotFoundError("Subfeddit not found"),
+            404,
+            "The specified subfeddit could not be found. Please check the subfeddit and try again.",
+        ),
+        (
+            APIClientError("Client error"),
+            500,
+            "An error occurred with the Feddit API client. Please try again later.",
+        ),
+        (InvalidPolarityError(1.5), 400, "The provided polarity value '1.5' is invalid."),
+        (
+            _CustomNotFoundError("Not found"),
+            404,
+            "The requested resource could not be found in the Feddit API.",
+        ),
+    ],
+)
+async def test_handle_error(exc: Exception, status_code: int, message: str) -> None:
+    """Test the error responses for the exceptions handled by the application."""
+    response = await _handle_error(None, exc)
+
+    assert response.status_code == status_code
+    assert ErrorResponse.model_validate_json(response.body) == ErrorResponse(
+        message=message, details=str(exc), type=type(exc).__name__
+    )
+
+
+async def test_general_exception_handler() -> None:
+    """Test the error response for unhandled exceptions."""
+    response = await general_exception_handler(None, RuntimeError("Boom"))
+
+    assert response.status_code == 500
+    assert ErrorResponse.model_validate_json(response.body) == ErrorResponse(
+        message="An unexpected error occurred.", details="Boom", type="InternalServerError"
+    )
+
+
+async def test_stream_sentiments() -> None:
+    """Test streaming the sentiment analysis of comments as server-sent events."""
+    sentiments = [
+        CommentSentiment(
+            comment_id=1, comment="Comment 1", polarity=0.5, classification="positive"
+        ),
+        CommentSentiment(
+            comment_id=2, comment="Comment 2", polarity=-0.5, classification="negative"
+        ),
+    ]
+
+    async def _analysis() -> list[CommentSentiment]:
+        return sentiments
+
+    events = [event async for event in _stream_sentiments(_analysis)]
+
+    assert events == [
+        b"data: %b\n\n" % sentiment.model_dump_json().encode() for sentiment in sentiments
+    ]
+
+
+async def test_stream_sentiments_error() -> None:
+    """Test errors during the sentiment analysis are streamed as an error event."""
+
+    async def _analysis() -> list[CommentSentiment]:
+        raise SubfedditNotFoundError("Subfeddit not found")
+
+    events = [event async for event in _stream_sentiments(_analysis)]
+
+    assert len(events) == 1
+    event, data = events[0].removesuffix(b"\n\n").split(b"\n")
+    assert event == b"event: error"
+    error = ErrorResponse.model_validate_json(data.removeprefix(b"data: "))
+    assert error.type == "SubfedditNotFoundError"
+
+
+async def test_stream_sentiments_unexpected_error() -> None:
+    """Test errors without a dedicated error response are streamed as a generic error event."""
+
+    async def _analysis() -> list[CommentSentiment]:
+        raise ValueError("Boom")
+
+    events = [event async for event in _stream_sentiments(_analysis)]
+
+    assert len(events) == 1
+    event, data = events[0].removesuffix(b"\n\n").split(b"\n")
+    assert event == b"event: error"
+    assert ErrorResponse.model_validate_json(data.removeprefix(b"data: ")) == ErrorResponse(
+        message="An unexpected error occurred.", details="Boom", type="InternalServerError"
+    )
+
+
+@pytest_asyncio.fixture
+async def api_client(
+    mock_feddit_client: FedditAPIClient, mock_sentiment_analyzer: SentimentAnalyzer
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Fixture for a client of the API application using the mocked external API clients."""
+    app.dependency_overrides[get_feddit_api_client] = lambda: mock_feddit_client
+    app.dependency_overrides[get_sentiment_analyzer] = lambda: mock_sentiment_analyzer
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+async def test_comments_id_stream(
+    api_client: httpx.AsyncClient,
+    mock_feddit_client: FedditAPIClient,
+    mock_sentiment_analyzer: SentimentAnalyzer,
+    subfeddit_id: int,
+    single_comment: list[CommentInfo],
+    single_sentiment: list[SentimentAnalysis],
+) -> None:
+    """Test the sentiment analysis of comments is streamed as server-sent events."""
+    mock_feddit_client.get_subfeddit_comments = AsyncMock(return_value=single_comment)
+    mock_sentiment_analyzer.analyze_sentiment = AsyncMock(return_value=single_sentiment)
+
+    response = await api_client.post(
+        _COMMENTS_ID_PATH, json={"subfeddit_id": subfeddit_id, "stream": True}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.content.split(b"\n\n") == [
+        b"data: "
+        + CommentSentiment(
+            comment_id=single_comment[0].id,
+            comment=single_comment[0].text,
+            polarity=single_sentiment[0].polarity,
+            classification=single_sentiment[0].sentiment.value,
+        )
+        .model_dump_json()
+        .encode(),
+        b"",
+    ]
+
+
+async def test_comments_id_stream_error(
+    api_client: httpx.AsyncClient, mock_feddit_client: FedditAPIClient, subfeddit_id: int
+) -> None:
+    """Test unexpected errors while streaming are sent as an error event."""
+    mock_feddit_client.get_subfeddit_comments = AsyncMock(side_effect=ValueError("Boom"))
+
+    response = await api_client.post(
+        _COMMENTS_ID_PATH, json={"subfeddit_id": subfeddit_id, "stream": True}
+    )
+
+    assert response.status_code == 200
+    event, data = response.content.removesuffix(b"\n\n").split(b"\n")
+    assert event == b"event: error"
+    assert ErrorResponse.model_validate_json(data.removeprefix(b"data: ")).details == "Boom"
+
+
+@pytest.mark.parametrize("path", [_COMMENTS_ID_PATH, "/api/v1/classify_comments/subfeddit_title"])
+def test_comments_stream_docs(path: str) -> None:
+    """Test the streamed responses are documented in the OpenAPI schema."""
+    content = app.openapi()["paths"][path]["post"]["responses"]["200"]["content"]
+    assert set(content) == {"application/json", "text/event-stream"}
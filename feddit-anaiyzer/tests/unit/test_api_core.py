@@ -3,20 +3,25 @@
 from unittest.mock import AsyncMock
 
 import pytest
+from cachetools import TTLCache
 from fastapi import HTTPException
 
+from feddit_analyzer.api import _core
 from feddit_analyzer.api._core import (
     analyze_comments_sentiment,
     get_subfeddit_id,
+    sentiment_cache,
     subfeddit_cache,
 )
 from feddit_analyzer.feddit_client import FedditAPIClient
+from feddit_analyzer.feddit_client.errors import NotFoundError
 from feddit_analyzer.feddit_client.schemas import CommentInfo
 from feddit_analyzer.sentiment_analysis import SentimentAnalyzer
+from feddit_analyzer.sentiment_analysis.errors import ResponseValidationError
 from feddit_analyzer.sentiment_analysis.schemas import SentimentAnalysis
+from feddit_analyzer.sentiment_analysis.sentiment import Sentiment
 
 
-@pytest.mark.asyncio()
 async def test_get_subfeddit_id_cached(
     mock_feddit_client: FedditAPIClient, suffedit_title: str, subfeddit_id: int
 ) -> None:
@@ -26,10 +31,9 @@ async def test_get_subfeddit_id_cached(
 
     result = await get_subfeddit_id(suffedit_title, mock_feddit_client)
     assert result == subfeddit_id
-    mock_feddit_client.get_subfeddit_info.assert_called_once_with(subfeddit_id)
+    mock_feddit_client.get_subfeddit_info.assert_not_awaited()
 
 
-@pytest.mark.asyncio()
 async def test_get_subfeddit_id_not_cached(
     mock_feddit_client: FedditAPIClient, suffedit_title: str, subfeddit_id: int
 ) -> None:
@@ -42,7 +46,31 @@ async def test_get_subfeddit_id_not_cached(
     assert result == subfeddit_id
 
 
-@pytest.mark.asyncio()
+async def test_get_subfeddit_id_multiple_batches(
+    monkeypatch: pytest.MonkeyPatch,
+    mock_feddit_client: FedditAPIClient,
+    suffedit_title: str,
+    subfeddit_id: int,
+) -> None:
+    """Test getting subfeddit ID when it is not in the first batch of subfeddits."""
+    monkeypatch.setattr(_core, "_QUERY_BATCH_SIZE", 1)
+    monkeypatch.setattr(_core, "_QUERY_CONCURRENCY", 2)
+
+    batches = {
+        0: [AsyncMock(title="other_subfeddit", id=subfeddit_id + 1)],
+        1: [AsyncMock(title=suffedit_title, id=subfeddit_id)],
+    }
+
+    async def _get_subfeddits(skip: int, **__) -> list[AsyncMock]:
+        return batches.get(skip, [])
+
+    mock_feddit_client.get_subfeddits = AsyncMock(side_effect=_get_subfeddits)
+
+    result = await get_subfeddit_id(suffedit_title, mock_feddit_client)
+    assert result == subfeddit_id
+    assert mock_feddit_client.get_subfeddits.await_count == 3
+
+
 async def test_get_subfeddit_id_not_found(mock_feddit_client: FedditAPIClient) -> None:
     """Test handling subfeddit not found."""
     subfeddit_title = "non_existing_subfeddit"
@@ -52,7 +80,77 @@ async def test_get_subfeddit_id_not_found(mock_feddit_client: FedditAPIClient) -
         await get_subfeddit_id(subfeddit_title, mock_feddit_client)
 
 
-@pytest.mark.asyncio()
+async def test_get_subfeddit_id_not_found_fresh_index(mock_feddit_client: FedditAPIClient) -> None:
+    """Test subfeddits are not looked through again while the subfeddit index is fresh."""
+    subfeddit_title = "non_existing_subfeddit"
+    mock_feddit_client.get_subfeddits = AsyncMock(return_value=[])
+
+    with pytest.raises(HTTPException):
+        await get_subfeddit_id(subfeddit_title, mock_feddit_client)
+
+    with pytest.raises(HTTPException):
+        await get_subfeddit_id(subfeddit_title, mock_feddit_client)
+
+    mock_feddit_client.get_subfeddits.assert_awaited_once()
+
+
+async def test_get_subfeddit_id_index_fresh_from_refresh_start(
+    monkeypatch: pytest.MonkeyPatch,
+    mock_feddit_client: FedditAPIClient,
+    suffedit_title: str,
+    subfeddit_id: int,
+) -> None:
+    """Test the subfeddit index stops being fresh when the first entries of its refresh expire."""
+    clock = [0.0]
+    monkeypatch.setattr(
+        _core,
+        "subfeddit_cache",
+        TTLCache(_core._CACHE_MAX_SIZE, _core._CACHE_TTL, lambda: clock[0]),
+    )
+    monkeypatch.setattr(
+        _core, "_subfeddit_index", _core._IndexFreshness(_core._CACHE_TTL, lambda: clock[0])
+    )
+
+    monkeypatch.setattr(_core, "_QUERY_BATCH_SIZE", 1)
+    monkeypatch.setattr(_core, "_QUERY_CONCURRENCY", 1)
+
+    async def _get_subfeddits(skip: int, **__) -> list[AsyncMock]:
+        clock[0] += 100  # Each page takes a while, so the scan ends 200 seconds after it starts.
+        return [AsyncMock(title=suffedit_title, id=subfeddit_id)] if skip == 0 else []
+
+    mock_feddit_client.get_subfeddits = AsyncMock(side_effect=_get_subfeddits)
+
+    with pytest.raises(HTTPException):
+        await get_subfeddit_id("non_existing_subfeddit", mock_feddit_client)
+
+    # The entry inserted with the first page has expired, but less than the TTL has passed since
+    # the scan ended. The index has to be refreshed instead of reporting the subfeddit as not found.
+    clock[0] = 100 + _core._CACHE_TTL
+    assert await get_subfeddit_id(suffedit_title, mock_feddit_client) == subfeddit_id
+    assert mock_feddit_client.get_subfeddits.await_count == 3
+
+
+async def test_get_subfeddit_id_more_subfeddits_than_cache(
+    monkeypatch: pytest.MonkeyPatch, mock_feddit_client: FedditAPIClient
+) -> None:
+    """Test finding subfeddits when there are more of them than the cache can hold."""
+    monkeypatch.setattr(_core, "subfeddit_cache", TTLCache(10, _core._CACHE_TTL))
+    mock_feddit_client.get_subfeddits = AsyncMock(
+        return_value=[AsyncMock(title=f"t{index}", id=index) for index in range(15)]
+    )
+
+    assert await get_subfeddit_id("t3", mock_feddit_client) == 3
+
+    # The index is incomplete, so a title that is not found is looked for again every time.
+    with pytest.raises(HTTPException):
+        await get_subfeddit_id("non_existing_subfeddit", mock_feddit_client)
+
+    with pytest.raises(HTTPException):
+        await get_subfeddit_id("non_existing_subfeddit", mock_feddit_client)
+
+    assert mock_feddit_client.get_subfeddits.await_count == 3
+
+
 async def test_analyze_comments_sentiment(
     mock_feddit_client: FedditAPIClient,
     mock_sentiment_analyzer: SentimentAnalyzer,
@@ -74,7 +172,6 @@ async def test_analyze_comments_sentiment(
     assert result[0].classification == single_sentiment[0].sentiment
 
 
-@pytest.mark.asyncio()
 async def test_analyze_comments_sentiment_no_comments(
     mock_feddit_client: FedditAPIClient,
     mock_sentiment_analyzer: SentimentAnalyzer,
@@ -89,7 +186,6 @@ async def test_analyze_comments_sentiment_no_comments(
     assert result == []
 
 
-@pytest.mark.asyncio()
 async def test_analyze_comments_sentiment_filter_by_date(
     mock_feddit_client: FedditAPIClient,
     mock_sentiment_analyzer: SentimentAnalyzer,
@@ -99,7 +195,7 @@ async def test_analyze_comments_sentiment_filter_by_date(
 ) -> None:
     """Test analyzing sentiment with comments filtered by creation date."""
     mock_feddit_client.get_subfeddit_comments = AsyncMock(return_value=comments)
-    mock_sentiment_analyzer.analyze_sentiment = AsyncMock(return_value=sentiments)
+    mock_sentiment_analyzer.analyze_sentiment = AsyncMock(return_value=sentiments[1:])
 
     min_datetime = 1625248000
     max_datetime = 1625249000
@@ -117,7 +213,6 @@ async def test_analyze_comments_sentiment_filter_by_date(
     assert result[0].comment == "Comment 2"
 
 
-@pytest.mark.asyncio()
 async def test_analyze_comments_sentiment_sort_by_polarity(
     mock_feddit_client: FedditAPIClient,
     mock_sentiment_analyzer: SentimentAnalyzer,
@@ -137,3 +232,135 @@ async def test_analyze_comments_sentiment_sort_by_polarity(
     assert result[0].polarity == 0.8
     assert result[1].comment_id == 2
     assert result[1].polarity == 0.2
+
+
+async def test_analyze_comments_sentiment_multiple_batches(
+    monkeypatch: pytest.MonkeyPatch,
+    mock_feddit_client: FedditAPIClient,
+    mock_sentiment_analyzer: SentimentAnalyzer,
+    subfeddit_id: int,
+) -> None:
+    """Test analyzing sentiment of comments retrieved in several batches."""
+    monkeypatch.setattr(_core, "_QUERY_LIMIT", 2)
+    monkeypatch.setattr(_core, "_QUERY_BATCH_SIZE", 2)
+    monkeypatch.setattr(_core, "_QUERY_CONCURRENCY", 2)
+
+    batches = {
+        0: [
+            CommentInfo(id=1, text="Comment 1", created_at=1, username="user1"),
+            CommentInfo(id=2, text="Comment 2", created_at=4, username="user2"),
+        ],
+        2: [
+            CommentInfo(id=3, text="Comment 3", created_at=3, username="user3"),
+            CommentInfo(id=4, text="Comment 4", created_at=2, username="user4"),
+        ],
+    }
+
+    async def _get_subfeddit_comments(*_, skip: int, **__) -> list[CommentInfo]:
+        return batches.get(skip, [])
+
+    mock_feddit_client.get_subfeddit_comments = AsyncMock(side_effect=_get_subfeddit_comments)
+
+    async def _analyze_sentiment(statements: list[str], *_, **__) -> list[SentimentAnalysis]:
+        return [
+            SentimentAnalysis(statement=statement, polarity=0.5, sentiment=Sentiment.POSITIVE)
+            for statement in statements
+        ]
+
+    mock_sentiment_analyzer.analyze_sentiment = AsyncMock(side_effect=_analyze_sentiment)
+
+    result = await analyze_comments_sentiment(
+        subfeddit_id, None, None, False, mock_feddit_client, mock_sentiment_analyzer
+    )
+    assert [comment.comment_id for comment in result] == [2, 3]
+    assert [comment.comment for comment in result] == ["Comment 2", "Comment 3"]
+    assert mock_feddit_client.get_subfeddit_comments.await_count == 3
+    assert mock_sentiment_analyzer.analyze_sentiment.await_count == 2
+
+
+async def test_analyze_comments_sentiment_subfeddit_not_found(
+    mock_feddit_client: FedditAPIClient,
+    mock_sentiment_analyzer: SentimentAnalyzer,
+    suffedit_title: str,
+    subfeddit_id: int,
+) -> None:
+    """Test a subfeddit that no longer exists is removed from the cache."""
+    subfeddit_cache[suffedit_title] = subfeddit_id
+    subfeddit_cache["other"] = subfeddit_id + 1
+    mock_feddit_client.get_subfeddit_comments = AsyncMock(side_effect=NotFoundError("Not found"))
+
+    with pytest.raises(NotFoundError):
+        await analyze_comments_sentiment(
+            subfeddit_id, None, None, False, mock_feddit_client, mock_sentiment_analyzer
+        )
+
+    assert suffedit_title not in subfeddit_cache
+    assert "other" in subfeddit_cache
+    assert not _core._subfeddit_index.is_fresh()
+
+
+async def test_analyze_comments_sentiment_duplicate_texts(
+    mock_feddit_client: FedditAPIClient,
+    mock_sentiment_analyzer: SentimentAnalyzer,
+    subfeddit_id: int,
+    single_sentiment: list[SentimentAnalysis],
+) -> None:
+    """Test analyzing sentiment of comments sharing the same text."""
+    mock_feddit_client.get_subfeddit_comments = AsyncMock(
+        return_value=[
+            CommentInfo(id=1, text="+1", created_at=1, username="user1"),
+            CommentInfo(id=2, text="+1", created_at=2, username="user2"),
+        ]
+    )
+    mock_sentiment_analyzer.analyze_sentiment = AsyncMock(return_value=single_sentiment)
+
+    result = await analyze_comments_sentiment(
+        subfeddit_id, None, None, False, mock_feddit_client, mock_sentiment_analyzer
+    )
+    assert [comment.comment_id for comment in result] == [2, 1]
+    assert all(comment.polarity == single_sentiment[0].polarity for comment in result)
+    mock_sentiment_analyzer.analyze_sentiment.assert_awaited_once()
+    assert mock_sentiment_analyzer.analyze_sentiment.await_args.args[0] == ["+1"]
+
+
+async def test_analyze_comments_sentiment_missing_results(
+    mock_feddit_client: FedditAPIClient,
+    mock_sentiment_analyzer: SentimentAnalyzer,
+    subfeddit_id: int,
+    comments: list[CommentInfo],
+    single_sentiment: list[SentimentAnalysis],
+) -> None:
+    """Test the model returning fewer results than texts sent is a response validation error."""
+    mock_feddit_client.get_subfeddit_comments = AsyncMock(return_value=comments)
+    mock_sentiment_analyzer.analyze_sentiment = AsyncMock(return_value=single_sentiment)
+
+    with pytest.raises(ResponseValidationError):
+        await analyze_comments_sentiment(
+            subfeddit_id, None, None, False, mock_feddit_client, mock_sentiment_analyzer
+        )
+
+    assert not sentiment_cache
+
+
+async def test_analyze_comments_sentiment_cached(
+    mock_feddit_client: FedditAPIClient,
+    mock_sentiment_analyzer: SentimentAnalyzer,
+    subfeddit_id: int,
+    single_comment: list[CommentInfo],
+    single_sentiment: list[SentimentAnalysis],
+) -> None:
+    """Test analyzing sentiment of comments whose sentiment is already cached."""
+    mock_feddit_client.get_subfeddit_comments = AsyncMock(return_value=single_comment)
+    mock_sentiment_analyzer.analyze_sentiment = AsyncMock(return_value=single_sentiment)
+
+    first_result = await analyze_comments_sentiment(
+        subfeddit_id, None, None, False, mock_feddit_client, mock_sentiment_analyzer
+    )
+    second_result = await analyze_comments_sentiment(
+        subfeddit_id, None, None, False, mock_feddit_client, mock_sentiment_analyzer
+    )
+    assert first_result == second_result
+    assert second_result[0].polarity == single_sentiment[0].polarity
+
+    mock_sentiment_analyzer.analyze_sentiment.assert_awaited_once()
+    assert (single_comment[0].id, single_comment[0].text) in sentiment_cache
@@ -0,0 +1,64 @@
+"""Unit tests for the API schemas."""
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from feddit_analyzer.api._schemas import (
+    CommentSentiment,
+    CommentSentimentIDRequest,
+    CommentSentimentRequest,
+    CommentSentimentResponse,
+)
+
+
+@pytest.mark.parametrize(
+    ("model", "subfeddit"),
+    [
+        (CommentSentimentIDRequest, {"subfeddit_id": 1}),
+        (CommentSentimentRequest, {"subfeddit_title": "title 1"}),
+    ],
+)
+def test_request_datetime_range(model: type[BaseModel], subfeddit: dict[str, int | str]) -> None:
+    """Test requests only accept a minimum datetime that is not after the maximum datetime."""
+    request = model(**subfeddit, min_datetime=1, max_datetime=1)
+    assert (request.min_datetime, request.max_datetime) == (1, 1)
+
+    with pytest.raises(ValidationError):
+        model(**subfeddit, min_datetime=2, max_datetime=1)
+
+
+@pytest.mark.parametrize(
+    ("model", "subfeddit_field"),
+    [(CommentSentimentIDRequest, "subfeddit_id"), (CommentSentimentRequest, "subfeddit_title")],
+)
+def test_request_field_order(model: type[BaseModel], subfeddit_field: str) -> None:
+    """Test the subfeddit field of requests comes before the options in the OpenAPI schema."""
+    assert list(model.model_json_schema()["properties"]) == [
+        subfeddit_field,
+        "min_datetime",
+        "max_datetime",
+        "sort_by_polarity",
+        "stream",
+    ]
+
+
+def test_comment_sentiment_requires_polarity() -> None:
+    """Test the sentiment of a comment cannot be built without its polarity."""
+    with pytest.raises(ValidationError):
+        CommentSentiment(comment_id=1, comment="Comment 1", classification="positive")
+
+
+def test_comment_sentiment_polarity_range() -> None:
+    """Test the polarity of a comment must be between -1 and 1."""
+    with pytest.raises(ValidationError):
+        CommentSentiment(comment_id=1, comment="Comment 1", polarity=1.5, classification="positive")
+
+
+def test_response_no_more_than_25_comments() -> None:
+    """Test responses cannot hold more than 25 comments."""
+    comment = CommentSentiment(
+        comment_id=1, comment="Comment 1", polarity=0.5, classification="positive"
+    )
+
+    with pytest.raises(ValidationError):
+        CommentSentimentResponse(subfeddit_title="title 1", comments=[comment] * 26)
@@ -1,5 +1,9 @@
 """Unit tests for the ``FedditAPIClient``."""
 
+from collections.abc import Awaitable, Callable
+from types import SimpleNamespace
+
+import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 
@@ -9,73 +13,114 @@ from feddit_analyzer.feddit_client.errors import (
     BadRequestError,
     InternalServerError,
     NotFoundError,
-    ResponseValidationError,
     UnexpectedError,
 )
-
-
-@pytest.mark.asyncio()
-async def test_get_version_success(
-    feddit_client: FedditAPIClient, feddit_base_url: str, httpx_mock: HTTPXMock
+from feddit_analyzer.feddit_client.schemas import CommentInfo, SubfedditInfo, SubfedditResponse
+
+pytestmark = pytest.mark.asyncio(scope="session")
+
+_DEFAULT_PAGE = {"skip": 0, "limit": 10}
+
+_SUBFEDDIT_1 = {"id": 1, "username": "user1", "title": "subfeddit1", "description": "desc1"}
+_SUBFEDDIT_2 = {"id": 2, "username": "user2", "title": "subfeddit2", "description": "desc2"}
+_COMMENT_1 = {"id": 1, "username": "user1", "text": "comment1", "created_at": 1625247600}
+_COMMENT_2 = {"id": 2, "username": "user2", "text": "comment2", "created_at": 1625248600}
+
+_SUBFEDDITS_RESPONSE = {"limit": 10, "skip": 0, "subfeddits": [_SUBFEDDIT_1, _SUBFEDDIT_2]}
+_SUBFEDDIT_RESPONSE = {**_SUBFEDDIT_1, "limit": 10, "skip": 0, "comments": []}
+_COMMENTS_RESPONSE = {
+    "subfeddit_id": 1,
+    "limit": 10,
+    "skip": 0,
+    "comments": [_COMMENT_1, _COMMENT_2],
+}
+
+
+@pytest.mark.parametrize(
+    ("endpoint", "params", "response_data", "get", "expected"),
+    [
+        pytest.param(
+            "version",
+            {},
+            {"version": "0.1.0"},
+            lambda client: client.get_version(),
+            "0.1.0",
+            id="version",
+        ),
+        pytest.param(
+            "subfeddits",
+            _DEFAULT_PAGE,
+            _SUBFEDDITS_RESPONSE,
+            lambda client: client.get_subfeddits(),
+            [SubfedditInfo(**_SUBFEDDIT_1), SubfedditInfo(**_SUBFEDDIT_2)],
+            id="subfeddits",
+        ),
+        pytest.param(
+            "subfeddit",
+            {"subfeddit_id": 1},
+            _SUBFEDDIT_RESPONSE,
+            lambda client: client.get_subfeddit_info(1),
+            SubfedditResponse(**_SUBFEDDIT_RESPONSE),
+            id="subfeddit_info",
+        ),
+        pytest.param(
+            "comments",
+            {"subfeddit_id": 1, **_DEFAULT_PAGE},
+            _COMMENTS_RESPONSE,
+            lambda client: client.get_subfeddit_comments(1),
+            [CommentInfo(**_COMMENT_1), CommentInfo(**_COMMENT_2)],
+            id="subfeddit_comments",
+        ),
+    ],
+)
+async def test_get_success(
+    feddit_client: FedditAPIClient,
+    feddit_urls: SimpleNamespace,
+    httpx_mock: HTTPXMock,
+    endpoint: str,
+    params: dict[str, int],
+    response_data: dict,
+    get: Callable[[FedditAPIClient], Awaitable[object]],
+    expected: object,
 ) -> None:
-    """Test getting the API version."""
-    httpx_mock.add_response(url=f"{feddit_base_url}/api/v1/version", json={"version": "0.1.0"})
-    version = await feddit_client.get_version()
-    assert version == "0.1.0"
+    """Test getting the API version, subfeddits, subfeddit information and comments."""
+    httpx_mock.add_response(
+        method="GET",
+        url=httpx.URL(getattr(feddit_urls, endpoint), params=params),
+        json=response_data,
+    )
+    assert await get(feddit_client) == expected
 
 
-@pytest.mark.asyncio()
-async def test_get_version_unsupported(feddit_base_url: str, httpx_mock: HTTPXMock) -> None:
+async def test_get_version_unsupported(
+    feddit_client: FedditAPIClient, feddit_urls: SimpleNamespace, httpx_mock: HTTPXMock
+) -> None:
     """Test API version is unsupported."""
-    httpx_mock.add_response(url=f"{feddit_base_url}/api/v1/version", json={"version": "0.2.0"})
+    httpx_mock.add_response(method="GET", url=feddit_urls.version, json={"version": "0.2.0"})
     with pytest.raises(APIVersionError):
-        await FedditAPIClient(feddit_base_url).check_version()
+        await feddit_client.check_version()
 
 
-@pytest.mark.asyncio()
-async def test_get_subfeddits_success(
-    feddit_client: FedditAPIClient, feddit_base_url: str, httpx_mock: HTTPXMock
-) -> None:
-    """Test getting a list of subfeddits."""
-    response_data = {
-        "limit": 10,
-        "skip": 0,
-        "subfeddits": [
-            {"id": 1, "username": "user1", "title": "subfeddit1", "description": "desc1"},
-            {"id": 2, "username": "user2", "title": "subfeddit2", "description": "desc2"},
-        ],
-    }
-
-    httpx_mock.add_response(
-        url=f"{feddit_base_url}/api/v1/subfeddits/?skip=0&limit=10", json=response_data
-    )
-
-    subfeddits = await feddit_client.get_subfeddits()
-    assert len(subfeddits) == 2
-    assert subfeddits[0].id == 1
-    assert subfeddits[1].username == "user2"
-
-
-@pytest.mark.asyncio()
-@pytest.mark.parametrize(("skip", "limit"), [(0, 5), (5, 10)])
+@pytest.mark.parametrize(
+    ("skip", "limit", "response_data"),
+    [
+        (skip, limit, {"limit": limit, "skip": skip, "subfeddits": [_SUBFEDDIT_1]})
+        for skip, limit in [(0, 5), (5, 10)]
+    ],
+)
 async def test_get_subfeddits_params(
     feddit_client: FedditAPIClient,
-    feddit_base_url: str,
+    feddit_urls: SimpleNamespace,
     httpx_mock: HTTPXMock,
     skip: int,
     limit: int,
+    response_data: dict,
 ) -> None:
     """Test getting a list of subfeddits with parameters."""
-    response_data = {
-        "limit": limit,
-        "skip": skip,
-        "subfeddits": [
-            {"id": 1, "username": "user1", "title": "subfeddit1", "description": "desc1"},
-        ],
-    }
-
     httpx_mock.add_response(
-        url=f"{feddit_base_url}/api/v1/subfeddits/?skip={skip}&limit={limit}", json=response_data
+        method="GET",
+        url=httpx.URL(feddit_urls.subfeddits, params={"skip": skip, "limit": limit}),
+        json=response_data,
     )
 
     subfeddits = await feddit_client.get_subfeddits(skip=skip, limit=limit)
@@ -83,173 +128,59 @@ async def test_get_subfeddits_params(
     assert len(subfeddits) == 1
 
 
-@pytest.mark.asyncio()
-async def test_get_subfeddit_info_success(
-    feddit_client: FedditAPIClient, feddit_base_url: str, httpx_mock: HTTPXMock
-) -> None:
-    """Test getting detailed information of a specific subfeddit."""
-    response_data = {
-        "id": 1,
-        "username": "user1",
-        "title": "subfeddit1",
-        "description": "desc1",
-        "limit": 10,
-        "skip": 0,
-        "comments": [],
-    }
-
-    httpx_mock.add_response(
-        url=f"{feddit_base_url}/api/v1/subfeddit/?subfeddit_id=1", json=response_data
-    )
-
-    subfeddit = await feddit_client.get_subfeddit_info(1)
-    assert subfeddit.id == 1
-    assert subfeddit.title == "subfeddit1"
-
-
-@pytest.mark.asyncio()
-async def test_get_subfeddit_comments_success(
-    feddit_client: FedditAPIClient, feddit_base_url: str, httpx_mock: HTTPXMock
-) -> None:
-    """Test getting comments for a specific subfeddit."""
-    response_data = {
-        "subfeddit_id": 1,
-        "limit": 10,
-        "skip": 0,
-        "comments": [
-            {"id": 1, "username": "user1", "text": "comment1", "created_at": 1625247600},
-            {"id": 2, "username": "user2", "text": "comment2", "created_at": 1625248600},
-        ],
-    }
-
-    httpx_mock.add_response(
-        url=f"{feddit_base_url}/api/v1/comments/?subfeddit_id=1&skip=0&limit=10", json=response_data
-    )
-
-    comments = await feddit_client.get_subfeddit_comments(1)
-    assert len(comments) == 2
-    assert comments[0].id == 1
-    assert comments[1].username == "user2"
-
-
-@pytest.mark.asyncio()
-async def test_get_version_bad_request(
-    feddit_client: FedditAPIClient, feddit_base_url: str, httpx_mock: HTTPXMock
-) -> None:
-    """Test handling of a bad request when getting the API version."""
-    httpx_mock.add_response(
-        url=f"{feddit_base_url}/api/v1/version", status_code=400, text="Bad Request"
-    )
-    with pytest.raises(BadRequestError):
-        await feddit_client.get_version()
-
-
-@pytest.mark.asyncio()
-async def test_get_subfeddits_not_found(
-    feddit_client: FedditAPIClient, feddit_base_url: str, httpx_mock: HTTPXMock
-) -> None:
-    """Test handling of a not found error when getting subfeddits."""
-    httpx_mock.add_response(
-        url=f"{feddit_base_url}/api/v1/subfeddits/?skip=0&limit=10",
-        status_code=404,
-        text="Not Found",
-    )
-    with pytest.raises(NotFoundError):
-        await feddit_client.get_subfeddits()
-
-
-@pytest.mark.asyncio()
-async def test_get_subfeddit_info_internal_error(
-    feddit_client: FedditAPIClient, feddit_base_url: str, httpx_mock: HTTPXMock
-) -> None:
-    """Test handling of an internal server error when getting subfeddit info."""
-    httpx_mock.add_response(
-        url=f"{feddit_base_url}/api/v1/subfeddit/?subfeddit_id=1",
-        status_code=500,
-        text="Internal Server Error",
-    )
-    with pytest.raises(InternalServerError):
-        await feddit_client.get_subfeddit_info(1)
-
-
-@pytest.mark.asyncio()
-async def test_get_subfeddit_comments_unexpected_error(
-    feddit_client: FedditAPIClient, feddit_base_url: str, httpx_mock: HTTPXMock
-) -> None:
-    """Test handling of an unexpected error when getting subfeddit comments."""
-    httpx_mock.add_response(
-        url=f"{feddit_base_url}/api/v1/comments/?subfeddit_id=1&skip=0&limit=10",
-        status_code=418,
-        text="Unexpected",
-    )
-    with pytest.raises(UnexpectedError):
-        await feddit_client.get_subfeddit_comments(1)
-
-
-@pytest.mark.asyncio()
-async def test_get_version_validation_error(
-    feddit_client: FedditAPIClient, feddit_base_url: str, httpx_mock: HTTPXMock
-) -> None:
-    """Test validation error when the version response schema is incorrect."""
-    httpx_mock.add_response(url=f"{feddit_base_url}/api/v1/version", json={"ver": "0.1.0"})
-    with pytest.raises(ResponseValidationError):
-        await feddit_client.get_version()
-
-
-@pytest.mark.asyncio()
-async def test_get_subfeddits_validation_error(
-    feddit_client: FedditAPIClient, feddit_base_url: str, httpx_mock: HTTPXMock
-) -> None:
-    """Test validation error when the subfeddits response schema is incorrect."""
-    response_data = {
-        "limit": 10,
-        "skip": 0,
-        "subfeddits": [
-            {"id": 1, "username": "user1", "title": "subfeddit1"},
-            {"id": 2, "username": "user2", "title": "subfeddit2", "description": "desc2"},
-        ],
-    }
-    httpx_mock.add_response(
-        url=f"{feddit_base_url}/api/v1/subfeddits/?skip=0&limit=10", json=response_data
-    )
-    with pytest.raises(ResponseValidationError):
-        await feddit_client.get_subfeddits()
-
-
-@pytest.mark.asyncio()
-async def test_get_subfeddit_info_validation_error(
-    feddit_client: FedditAPIClient, feddit_base_url: str, httpx_mock: HTTPXMock
-) -> None:
-    """Test validation error when the subfeddit info response schema is incorrect."""
-    response_data = {
-        "id": 1,
-        "username": "user1",
-        "title": "subfeddit1",
-        "description": "desc1",
-        "limit": 10,
-        "skip": 0,
-        "comments": [{"id": 1, "username": "user1", "text": "comment1"}],
-    }
-    httpx_mock.add_response(
-        url=f"{feddit_base_url}/api/v1/subfeddit/?subfeddit_id=1", json=response_data
-    )
-    with pytest.raises(ResponseValidationError):
-        await feddit_client.get_subfeddit_info(1)
-
-
-@pytest.mark.asyncio()
-async def test_get_subfeddit_comments_validation_error(
-    feddit_client: FedditAPIClient, feddit_base_url: str, httpx_mock: HTTPXMock
+@pytest.mark.parametrize(
+    ("endpoint", "params", "status_code", "error", "get"),
+    [
+        pytest.param(
+            "version",
+            {},
+            400,
+            BadRequestError,
+            lambda client: client.get_version(),
+            id="bad_request",
+        ),
+        pytest.param(
+            "subfeddits",
+            _DEFAULT_PAGE,
+            404,
+            NotFoundError,
+            lambda client: client.get_subfeddits(),
+            id="not_found",
+        ),
+        pytest.param(
+            "subfeddit",
+            {"subfeddit_id": 1},
+            500,
+            InternalServerError,
+            lambda client: client.get_subfeddit_info(1),
+            id="internal_error",
+        ),
+        pytest.param(
+            "comments",
+            {"subfeddit_id": 1, **_DEFAULT_PAGE},
+            418,
+            UnexpectedError,
+            lambda client: client.get_subfeddit_comments(1),
+            id="unexpected_error",
+        ),
+    ],
+)
+async def test_get_error_status(
+    feddit_client: FedditAPIClient,
+    feddit_urls: SimpleNamespace,
+    httpx_mock: HTTPXMock,
+    endpoint: str,
+    params: dict[str, int],
+    status_code: int,
+    error: type[Exception],
+    get: Callable[[FedditAPIClient], Awaitable[object]],
 ) -> None:
-    """Test validation error when the subfeddit comments response schema is incorrect."""
-    response_data = {
-        "subfeddit_id": 1,
-        "limit": 10,
-        "skip": 0,
-        "comments": [{"id": 1, "username": "user1", "created_at": 1625247600}],
-    }
+    """Test handling of error status codes returned by the API."""
     httpx_mock.add_response(
-        url=f"{feddit_base_url}/api/v1/comments/?subfeddit_id=1&skip=0&limit=10", json=response_data
+        method="GET",
+        url=httpx.URL(getattr(feddit_urls, endpoint), params=params),
+        status_code=status_code,
+        text="Error",
     )
-    with pytest.raises(ResponseValidationError):
-        await feddit_client.get_subfeddit_comments(1)
+    with pytest.raises(error):
+        await get(feddit_client)
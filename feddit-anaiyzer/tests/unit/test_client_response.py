@@ -0,0 +1,66 @@
+"""Unit tests for the handling of the Feddit API responses, without going through the client."""
+
+import httpx
+import pytest
+from pydantic import TypeAdapter
+
+from feddit_analyzer.feddit_client._client import (
+    _COMMENTS_ADAPTER,
+    _SUBFEDDIT_ADAPTER,
+    _SUBFEDDITS_ADAPTER,
+    _VERSION_ADAPTER,
+    _handle_response,
+)
+from feddit_analyzer.feddit_client.errors import ResponseValidationError
+
+_INVALID_SUBFEDDITS_RESPONSE = {
+    "limit": 10,
+    "skip": 0,
+    "subfeddits": [
+        {"id": 1, "username": "user1", "title": "subfeddit1"},
+        {"id": 2, "username": "user2", "title": "subfeddit2", "description": "desc2"},
+    ],
+}
+_INVALID_SUBFEDDIT_RESPONSE = {
+    "id": 1,
+    "username": "user1",
+    "title": "subfeddit1",
+    "description": "desc1",
+    "limit": 10,
+    "skip": 0,
+    "comments": [{"id": 1, "username": "user1", "text": "comment1"}],
+}
+_INVALID_COMMENTS_RESPONSE = {
+    "subfeddit_id": 1,
+    "limit": 10,
+    "skip": 0,
+    "comments": [{"id": 1, "username": "user1", "created_at": 1625247600}],
+}
+
+
+@pytest.mark.parametrize(
+    ("adapter", "response"),
+    [
+        pytest.param(_VERSION_ADAPTER, httpx.Response(200, json={"ver": "0.1.0"}), id="version"),
+        pytest.param(
+            _SUBFEDDITS_ADAPTER,
+            httpx.Response(200, json=_INVALID_SUBFEDDITS_RESPONSE),
+            id="subfeddits",
+        ),
+        pytest.param(
+            _SUBFEDDIT_ADAPTER,
+            httpx.Response(200, json=_INVALID_SUBFEDDIT_RESPONSE),
+            id="subfeddit_info",
+        ),
+        pytest.param(
+            _COMMENTS_ADAPTER,
+            httpx.Response(200, json=_INVALID_COMMENTS_RESPONSE),
+            id="subfeddit_comments",
+        ),
+        pytest.param(_VERSION_ADAPTER, httpx.Response(200, text="not json"), id="invalid_json"),
+    ],
+)
+def test_handle_response_validation_error(adapter: TypeAdapter, response: httpx.Response) -> None:
+    """Test validation error when the response content does not match the expected schema."""
+    with pytest.raises(ResponseValidationError):
+        _handle_response(response, adapter)
@@ -0,0 +1,38 @@
+"""Unit tests for the ``wait-api`` script."""
+
+from types import SimpleNamespace
+
+from pytest_httpx import HTTPXMock
+
+from feddit_analyzer.scripts._wait_api import _wait_api
+
+
+async def test_wait_api_retries_non_json_response(
+    feddit_urls: SimpleNamespace, feddit_base_url: str, httpx_mock: HTTPXMock
+) -> None:
+    """Test a response that is not JSON is retried like other transient failures."""
+    httpx_mock.add_response(url=feddit_urls.version, text="<html>Starting</html>")
+    httpx_mock.add_response(url=feddit_urls.version, json={"version": "0.1.0"})
+
+    assert await _wait_api(feddit_base_url, timeout=1, wait=0, retries=2)
+    assert len(httpx_mock.get_requests()) == 2
+
+
+async def test_wait_api_non_object_response(
+    feddit_urls: SimpleNamespace, feddit_base_url: str, httpx_mock: HTTPXMock
+) -> None:
+    """Test a JSON response that is not an object is reported as an unsupported version."""
+    httpx_mock.add_response(url=feddit_urls.version, json=["0.1.0"])
+
+    assert await _wait_api(feddit_base_url, timeout=1, wait=0, retries=2)
+    assert len(httpx_mock.get_requests()) == 1
+
+
+async def test_wait_api_exhausted_retries(
+    feddit_urls: SimpleNamespace, feddit_base_url: str, httpx_mock: HTTPXMock
+) -> None:
+    """Test the API is reported as down when every attempt fails."""
+    httpx_mock.add_response(url=feddit_urls.version, text="not json")
+
+    assert not await _wait_api(feddit_base_url, timeout=1, wait=0, retries=2)
+    assert len(httpx_mock.get_requests()) == 2